@@ -1,7 +1,8 @@
 """Easy AI player: shallow minimax with simple evaluation."""
 
 from player import Player
-from minimax import minimax
+from minimax import minimax, iterative_deepening, SearchStats
+from transposition import TranspositionTable
 from evaluation import eval_simple
 from utils import PLAYER_NAMES
 
@@ -11,9 +12,31 @@ class EasyAI(Player):
 
     DEPTH = 1
 
-    def __init__(self, color):
+    def __init__(self, color, memory_budget=None):
         super().__init__(color, f"Easy AI ({PLAYER_NAMES[color]})")
+        # Easy keeps no caches between moves; the budget caps the table
+        # of each timed or stoppable search
+        self.memory_budget = memory_budget
+        self.last_depth = None
 
     def get_move(self, board):
-        _, move = minimax(board, self.DEPTH, True, self.color, eval_simple)
+        stats = self.last_stats = SearchStats() if self.collect_stats else None
+        self.last_depth = None
+        if self.time_limit or self.stop is not None:
+            _, move, self.last_depth = iterative_deepening(
+                board, self.color, eval_simple, self.time_limit,
+                tt=TranspositionTable(max_bytes=self.memory_budget),
+                max_depth=None if self.time_limit else self.DEPTH,
+                stats=stats, stop=self.stop
+            )
+            return move
+        _, move = minimax(board, self.DEPTH, True, self.color, eval_simple, stats)
         return move
+
+    def search_report(self):
+        parts = []
+        if self.last_depth is not None:
+            parts.append(f"reached depth {self.last_depth}")
+        if self.last_stats is not None:
+            parts.append(self.last_stats.summary())
+        return ", ".join(parts) or None
@@ -1,8 +1,14 @@
 """Hard AI player: alpha-beta pruning with advanced evaluation and move ordering."""
 
 from player import Player
-from minimax import alphabeta, order_moves_by_heuristic
+from minimax import search_root, iterative_deepening, SearchStats
+from ordering import KillerHistoryOrdering
 from evaluation import eval_advanced
+from inferior import InferiorCellFilter, CapturedFillEval
+from eval_cache import EvalCache
+from opening_book import book_move
+from parallel_search import RootParallelSearch
+from transposition import TranspositionTable, table_size
 from utils import PLAYER_NAMES
 
 
@@ -10,15 +16,91 @@ class HardAI(Player):
     """Hard difficulty AI using depth-3 alpha-beta with advanced heuristic."""
 
     DEPTH = 3
+    TT_SIZE = 1 << 18
+    TT_SYMMETRIC = False  # share TT entries between symmetric positions; only
+                          # for symmetric evals (eval_advanced is not)
+    WORKERS = 1   # > 1 splits fixed-depth root moves across processes
+    FILL_CAPTURED = False   # fill captured cells before evaluating (slower leaves)
+    EVAL_CACHE_SIZE = 1 << 17
+    ENGINE = 'pvs'        # 'alphabeta' or 'pvs' (null-window re-searches)
+    ASPIRATION = None     # half-width of the iterative-deepening aspiration window
+    TT_SHARE = 0.75       # part of a memory budget given to the TT (rest: eval cache)
+    use_book = True
 
-    def __init__(self, color):
+    def __init__(self, color, memory_budget=None):
         super().__init__(color, f"Hard AI ({PLAYER_NAMES[color]})")
+        self.memory_budget = memory_budget
+        self.workers = self.WORKERS
+        self._tt_bytes = eval_bytes = None
+        if memory_budget is not None:
+            # With workers, this process and each worker process hold a TT
+            # and an evaluation cache, so each gets an equal part of the budget
+            share = memory_budget // (self.workers + 1) if self.workers > 1 else memory_budget
+            self._tt_bytes = int(share * self.TT_SHARE)
+            eval_bytes = share - self._tt_bytes
+        # Kept across moves: positions searched last turn recur this turn.
+        self.tt = TranspositionTable(self.TT_SIZE, symmetric=self.TT_SYMMETRIC,
+                                     max_bytes=self._tt_bytes)
+        self.ordering = InferiorCellFilter(KillerHistoryOrdering())
+        eval_fn = CapturedFillEval(eval_advanced) if self.FILL_CAPTURED else eval_advanced
+        self.eval_fn = EvalCache(eval_fn, self.EVAL_CACHE_SIZE, max_bytes=eval_bytes)
+        self.last_depth = None
+        self.from_book = False
+        self._parallel = None
+        self._parallel_used = False
 
     def get_move(self, board):
-        _, move = alphabeta(
-            board, self.DEPTH,
-            float('-inf'), float('inf'),
-            True, self.color,
-            eval_advanced, order_moves_by_heuristic
+        stats = self.last_stats = SearchStats() if self.collect_stats else None
+        self.from_book = False
+        self.last_depth = None
+        if self.use_book:
+            move = book_move(board)
+            if move is not None:
+                self.from_book = True
+                return move
+        self.ordering.new_search(board)
+        self._parallel_used = False
+        # A stop flag cannot reach the worker processes, so it needs the serial search
+        if self.workers > 1 and not self.time_limit and self.stop is None:
+            if self._parallel is None:
+                tt_size = 1 << 16
+                if self._tt_bytes is not None:
+                    tt_size = min(tt_size, table_size(self._tt_bytes))
+                self._parallel = RootParallelSearch(self.workers, tt_size)
+            _, move = self._parallel.search(
+                board, self.DEPTH, self.color,
+                self.eval_fn, self.ordering,
+                tt=self.tt, engine=self.ENGINE, stats=stats
+            )
+            self._parallel_used = True
+            self.last_depth = self.DEPTH
+            return move
+        if self.time_limit or self.stop is not None:
+            _, move, self.last_depth = iterative_deepening(
+                board, self.color, self.eval_fn, self.time_limit,
+                self.ordering, self.tt, None if self.time_limit else self.DEPTH,
+                stats=stats, stop=self.stop,
+                engine=self.ENGINE, aspiration=self.ASPIRATION
+            )
+            return move
+        _, move = search_root(
+            self.ENGINE, board, self.DEPTH,
+            float('-inf'), float('inf'), self.color,
+            self.eval_fn, self.ordering,
+            tt=self.tt, stats=stats
         )
         return move
+
+    def search_report(self):
+        if self.from_book:
+            return "book move"
+        parts = []
+        if self.last_depth is not None:
+            parts.append(f"reached depth {self.last_depth}")
+        parts.append(self.tt.summary())
+        if self._parallel_used and self._parallel.tt_summary():
+            parts.append(self._parallel.tt_summary())
+        parts.append(self.eval_fn.summary())
+        if self.last_stats is not None:
+            parts.append(self.last_stats.summary())
+        return ", ".join(parts)
@@ -0,0 +1,191 @@
+"""MCTS AI player: UCT tree search with RAVE and random playouts."""
+
+import math
+import random
+import time
+from player import Player
+from board import neighbor_table
+from opening_book import book_move
+from rollout import random_fill, full_board_winner
+from utils import PLAYER_NAMES, opponent
+
+# Approximate bytes per tree node: the node plus its untried and children
+# lists, which hold about one entry per empty cell (measured with tracemalloc).
+NODE_BYTES = 200
+CELL_BYTES = 9
+
+
+class _Node:
+    """Search tree node.
+
+    ``wins``/``visits`` are from the view of the player who made ``move``;
+    ``amaf_*`` count playouts in which that player owned the cell at all.
+    """
+
+    __slots__ = ('move', 'to_move', 'children', 'untried', 'winner',
+                 'visits', 'wins', 'amaf_visits', 'amaf_wins')
+
+    def __init__(self, move, to_move, untried):
+        self.move = move          # flat cell index, None at the root
+        self.to_move = to_move
+        self.children = []
+        self.untried = untried    # flat indices not yet expanded
+        self.winner = None        # set if the move into this node won the game
+        self.visits = 0
+        self.wins = 0
+        self.amaf_visits = 0
+        self.amaf_wins = 0
+
+
+class MCTSAI(Player):
+    """Monte Carlo Tree Search AI using UCT selection with RAVE/AMAF statistics.
+
+    Each iteration descends the tree, expands one move, then fills the
+    rest of the board at random and checks the winner once (Hex has no
+    draws). Runs PLAYOUTS iterations per move, or until ``time_limit``
+    seconds have passed if that is set, stopping early once ``stop`` is set.
+    With a ``memory_budget`` the tree stops growing once its estimated size
+    reaches the budget (the root is always expanded); playouts continue
+    from its leaves.
+    """
+
+    PLAYOUTS = 3000
+    EXPLORATION = 0.3
+    RAVE_K = 500   # visits at which RAVE and UCT values weigh equally
+    use_book = True
+
+    def __init__(self, color, seed=None, memory_budget=None):
+        super().__init__(color, f"MCTS AI ({PLAYER_NAMES[color]})")
+        self.memory_budget = memory_budget
+        # Drawn from the global generator so random.seed() makes games repeatable
+        self.rng = random.Random(random.getrandbits(64) if seed is None else seed)
+        self.last_playouts = 0
+        self.last_rate = 0.0
+        self.last_win_rate = None
+        self.from_book = False
+        self._nodes = 0
+        self._max_nodes = None
+
+    def get_move(self, board):
+        self.from_book = False
+        if self.use_book:
+            move = book_move(board)
+            if move is not None:
+                self.from_book = True
+                return move
+        board = board.clone()
+        root = _Node(None, self.color, self._untried(board))
+        if not root.untried:
+            return None
+        self._nodes = 1
+        if self.memory_budget is not None:
+            node_bytes = NODE_BYTES + CELL_BYTES * len(root.untried)
+            self._max_nodes = max(self.memory_budget // node_bytes, len(root.untried) + 1)
+
+        start = time.time()
+        deadline = start + self.time_limit if self.time_limit else None
+        playouts = 0
+        stop = self.stop
+        while True:
+            if playouts and stop is not None and stop.is_set():
+                break
+            if deadline is not None:
+                if playouts and time.time() >= deadline:
+                    break
+            elif playouts >= self.PLAYOUTS:
+                break
+            self._iterate(root, board)
+            playouts += 1
+
+        elapsed = time.time() - start
+        best = max(root.children, key=lambda child: child.visits)
+        self.last_playouts = playouts
+        self.last_rate = playouts / elapsed if elapsed > 0 else float('inf')
+        self.last_win_rate = best.wins / best.visits
+        return divmod(best.move, board.size)
+
+    def search_report(self):
+        if self.from_book:
+            return "book move"
+        if self.last_win_rate is None:
+            return None
+        return (f"{self.last_playouts} playouts ({self.last_rate:.0f}/s), "
+                f"estimated win rate {self.last_win_rate:.1%}")
+
+    def _untried(self, board):
+        moves = [i for i, v in enumerate(board.cells) if not v]
+        self.rng.shuffle(moves)
+        return moves
+
+    def _iterate(self, root, board):
+        """Run one select/expand/playout/backpropagate cycle."""
+        n = board.size
+        node = root
+        path = [root]
+
+        # Selection
+        while node.winner is None and not node.untried and node.children:
+            node = self._select(node)
+            board.play(node.move // n, node.move % n, opponent(node.to_move))
+            path.append(node)
+
+        # Expansion
+        if node.winner is None and node.untried and (
+                self._max_nodes is None or self._nodes < self._max_nodes):
+            self._nodes += 1
+            move = node.untried.pop()
+            mover = node.to_move
+            board.play(move // n, move % n, mover)
+            child = _Node(move, opponent(mover), self._untried(board))
+            if board.check_win(mover):
+                child.winner = mover
+            node.children.append(child)
+            node = child
+            path.append(node)
+
+        # Simulation
+        if node.winner is not None:
+            winner, final = node.winner, board.cells
+        else:
+            winner, final = self._playout(board, node.to_move)
+
+        # Backpropagation, with AMAF updates for every sibling whose cell
+        # ended up owned by the player choosing among them
+        for nd in path:
+            nd.visits += 1
+            if winner != nd.to_move:
+                nd.wins += 1
+            for child in nd.children:
+                if final[child.move] == nd.to_move:
+                    child.amaf_visits += 1
+                    if winner == nd.to_move:
+                        child.amaf_wins += 1
+
+        for _ in range(len(path) - 1):
+            board.undo()
+
+    def _select(self, node):
+        """Pick the child maximizing the RAVE-blended UCT value."""
+        log_visits = math.log(node.visits)
+        best_child = None
+        best_value = float('-inf')
+        for child in node.children:
+            q = child.wins / child.visits
+            if child.amaf_visits:
+                beta = math.sqrt(self.RAVE_K / (3 * child.visits + self.RAVE_K))
+                q = (1 - beta) * q + beta * child.amaf_wins / child.amaf_visits
+            value = q + self.EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+        return best_child
+
+    def _playout(self, board, to_move):
+        """Fill the empty cells at random, alternating colors from to_move.
+
+        Returns (winner, filled cells).
+        """
+        empty = [i for i, v in enumerate(board.cells) if not v]
+        cells = random_fill(board.cells, empty, to_move, self.rng)
+        n = board.size
+        return full_board_winner(cells, n, neighbor_table(n)), cells
@@ -1,8 +1,10 @@
 """Medium AI player: deeper minimax with shortest-path evaluation."""
 
 from player import Player
-from minimax import minimax
+from minimax import minimax, iterative_deepening, SearchStats
 from evaluation import eval_shortest_path
+from eval_cache import EvalCache
+from transposition import TranspositionTable
 from utils import PLAYER_NAMES
 
 
@@ -10,10 +12,40 @@ class MediumAI(Player):
     """Medium difficulty AI using depth-2 minimax with Dijkstra path heuristic."""
 
     DEPTH = 2
+    EVAL_CACHE_SIZE = 1 << 16
+    TT_SHARE = 0.5        # part of a memory budget given to timed searches' TT
 
-    def __init__(self, color):
+    def __init__(self, color, memory_budget=None):
         super().__init__(color, f"Medium AI ({PLAYER_NAMES[color]})")
+        self.memory_budget = memory_budget
+        self.last_depth = None
+        self._tt_bytes = eval_bytes = None
+        if memory_budget is not None:
+            self._tt_bytes = int(memory_budget * self.TT_SHARE)
+            eval_bytes = memory_budget - self._tt_bytes
+        # eval_shortest_path is symmetric, so rotated and swapped positions share entries
+        self.eval_fn = EvalCache(eval_shortest_path, self.EVAL_CACHE_SIZE,
+                                 max_bytes=eval_bytes, symmetric=True)
 
     def get_move(self, board):
-        _, move = minimax(board, self.DEPTH, True, self.color, eval_shortest_path)
+        stats = self.last_stats = SearchStats() if self.collect_stats else None
+        self.last_depth = None
+        if self.time_limit or self.stop is not None:
+            _, move, self.last_depth = iterative_deepening(
+                board, self.color, self.eval_fn, self.time_limit,
+                tt=TranspositionTable(max_bytes=self._tt_bytes),
+                max_depth=None if self.time_limit else self.DEPTH,
+                stats=stats, stop=self.stop
+            )
+            return move
+        _, move = minimax(board, self.DEPTH, True, self.color, self.eval_fn, stats)
         return move
+
+    def search_report(self):
+        parts = []
+        if self.last_depth is not None:
+            parts.append(f"reached depth {self.last_depth}")
+        parts.append(self.eval_fn.summary())
+        if self.last_stats is not None:
+            parts.append(self.last_stats.summary())
+        return ", ".join(parts)
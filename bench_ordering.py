@@ -0,0 +1,88 @@
+"""Benchmark: per-move vs batched heuristic move ordering.
+
+Compares three ways of ranking every empty cell by the path cost the
+player would have after playing there:
+
+  search    - one full shortest-path search per candidate move
+  heuristic - order_moves_by_heuristic (one distance field, local updates)
+  batched   - order_moves_batched (two distance fields, all moves at once)
+
+Usage: python bench_ordering.py [repeats]
+"""
+
+import random
+import sys
+import time
+
+from board import HexBoard
+from evaluation import _shortest_path_cost
+from minimax import order_moves_by_heuristic, order_moves_batched
+from utils import RED, BLUE
+
+SIZES = (7, 11, 13, 19)
+FILL = 0.25  # fraction of cells occupied in the benchmark positions
+
+
+def order_moves_by_search(board, moves, player):
+    """Reference ordering: a full shortest-path search for each candidate."""
+    center = board.size / 2.0
+
+    def score(move):
+        r, c = move
+        board.play(r, c, player)
+        path_cost = _shortest_path_cost(board, player)
+        board.undo()
+        return path_cost + (abs(r - center) + abs(c - center)) * 0.1
+
+    return sorted(moves, key=score)
+
+
+def random_position(size, seed):
+    """Seeded mid-game position with alternating colors and no winner yet."""
+    rng = random.Random(seed)
+    board = HexBoard(size)
+    cells = board.get_empty_cells()
+    rng.shuffle(cells)
+    color = RED
+    for r, c in cells[:int(size * size * FILL)]:
+        board.play(r, c, color)
+        if board.check_win(color):
+            board.undo()
+            continue
+        color = BLUE if color == RED else RED
+    return board, color
+
+
+def time_call(fn, board, moves, player, repeats):
+    """Best-of-repeats wall time for one call, in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(board, moves, player)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeats=3):
+    orderers = [
+        ('search', order_moves_by_search),
+        ('heuristic', order_moves_by_heuristic),
+        ('batched', order_moves_batched),
+    ]
+    print(f"{'size':>4}  {'moves':>5}" + "".join(f"  {name:>12}" for name, _ in orderers)
+          + f"  {'speedup':>8}")
+    for size in SIZES:
+        board, player = random_position(size, seed=size)
+        moves = board.get_empty_cells()
+        expected = order_moves_by_search(board, moves, player)
+        times = []
+        for name, fn in orderers:
+            if fn(board, moves, player) != expected:
+                raise AssertionError(f"{name} ordering differs at size {size}")
+            times.append(time_call(fn, board, moves, player, repeats))
+        cols = "".join(f"  {t * 1000:>10.2f}ms" for t in times)
+        print(f"{size:>4}  {len(moves):>5}{cols}  {times[0] / times[-1]:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,267 @@
+"""Benchmark suite for the search and evaluation hot paths.
+
+Runs every benchmark on a fixed corpus of seeded mid-game positions at
+several board sizes and writes the results as JSON, so two runs can be
+compared:
+
+    python benchmark.py --out before.json
+    ... change code ...
+    python benchmark.py --out after.json
+    python benchmark.py --compare before.json after.json
+
+For each benchmark and size the results hold the time per call, the peak
+memory allocated during one call (tracemalloc), and for searches the node
+count, nodes/sec and the full SearchStats breakdown, including the
+distribution of alpha-beta cutoffs by move index and by ply.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from board import HexBoard
+from evaluation import (_shortest_path_cost, _count_connected_to_start,
+                        eval_shortest_path, eval_advanced, eval_resistance)
+from minimax import (minimax, alphabeta, pvs, order_moves_by_heuristic, order_moves_batched,
+                     SearchStats)
+from ordering import KillerHistoryOrdering
+from inferior import InferiorCellFilter, analyze
+from utils import RED, BLUE
+
+SIZES = (5, 7, 9, 11)
+POSITIONS_PER_SIZE = 4
+FILL = 0.3          # fraction of cells occupied in corpus positions
+MIN_TIME = 0.2      # seconds each micro-benchmark is repeated for
+DEFAULT_THRESHOLD = 0.10
+
+# Search benchmarks are only run where they finish in reasonable time
+MINIMAX_DEPTH = 2
+MINIMAX_MAX_SIZE = 7
+ALPHABETA_DEPTH = 3
+ALPHABETA_MAX_SIZE = 9
+
+
+def build_corpus(sizes=SIZES, per_size=POSITIONS_PER_SIZE, seed=12345):
+    """Return {size: [(board, to_move), ...]} of seeded, undecided positions."""
+    corpus = {}
+    for size in sizes:
+        positions = []
+        for k in range(per_size):
+            rng = random.Random(seed * 1000 + size * 10 + k)
+            board = HexBoard(size)
+            cells = board.get_empty_cells()
+            rng.shuffle(cells)
+            color = RED
+            for r, c in cells[:int(size * size * FILL)]:
+                board.play(r, c, color)
+                if board.check_win(color):
+                    board.undo()
+                    continue
+                color = BLUE if color == RED else RED
+            positions.append((board, color))
+        corpus[size] = positions
+    return corpus
+
+
+def _time_per_call(call):
+    """Repeat call() for at least MIN_TIME seconds; return (seconds per call, calls)."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        call()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            return elapsed / calls, calls
+
+
+def _peak_memory(call):
+    """Peak bytes allocated while running call() once."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _micro(fn_for_position, positions):
+    """Benchmark a function over every corpus position of one size."""
+    calls = [fn_for_position(board, color) for board, color in positions]
+
+    def run_all():
+        for call in calls:
+            call()
+
+    per_pass, passes = _time_per_call(run_all)
+    return {
+        'time_per_call': per_pass / len(calls),
+        'calls': passes * len(calls),
+        'peak_bytes': max(_peak_memory(call) for call in calls),
+    }
+
+
+def _search(run, positions):
+    """Benchmark a search over every corpus position of one size.
+
+    Timing runs without stats; a second pass collects the counters.
+    """
+    start = time.perf_counter()
+    for board, color in positions:
+        run(board, color, None)
+    elapsed = time.perf_counter() - start
+
+    stats = SearchStats()
+    for board, color in positions:
+        position_stats = SearchStats()
+        run(board, color, position_stats)
+        stats.merge(position_stats)
+    board, color = positions[0]
+    total_cutoffs = sum(stats.cutoffs.values())
+    return {
+        'time_per_call': elapsed / len(positions),
+        'calls': len(positions),
+        'nodes': stats.nodes,
+        'nodes_per_sec': stats.nodes / elapsed if elapsed > 0 else 0.0,
+        'peak_bytes': _peak_memory(lambda: run(board, color, None)),
+        'cutoffs': total_cutoffs,
+        'first_move_cutoff_rate': stats.cutoffs.get(0, 0) / total_cutoffs if total_cutoffs else None,
+        'stats': stats.as_dict(),
+    }
+
+
+MICRO_BENCHMARKS = {
+    'check_win': lambda board, color: lambda: board.check_win(color),
+    'shortest_path_cost': lambda board, color: lambda: _shortest_path_cost(board, color),
+    'count_connected_to_start': lambda board, color: lambda: _count_connected_to_start(board, color),
+    'eval_advanced': lambda board, color: lambda: eval_advanced(board, color),
+    'eval_resistance': lambda board, color: lambda: eval_resistance(board, color),
+    'inferior_analyze': lambda board, color: lambda: analyze(board),
+    'order_moves_by_heuristic': lambda board, color: (
+        lambda moves=board.get_empty_cells(): order_moves_by_heuristic(board, moves, color)),
+    'order_moves_batched': lambda board, color: (
+        lambda moves=board.get_empty_cells(): order_moves_batched(board, moves, color)),
+}
+
+
+def _run_minimax(board, color, stats):
+    minimax(board, MINIMAX_DEPTH, True, color, eval_shortest_path, stats=stats)
+
+
+def _run_alphabeta(board, color, stats):
+    alphabeta(board, ALPHABETA_DEPTH, float('-inf'), float('inf'), True, color,
+              eval_advanced, order_moves_batched, stats=stats)
+
+
+def _run_alphabeta_killer(board, color, stats):
+    ordering = KillerHistoryOrdering()
+    ordering.new_search(board)
+    alphabeta(board, ALPHABETA_DEPTH, float('-inf'), float('inf'), True, color,
+              eval_advanced, ordering, stats=stats)
+
+
+def _run_alphabeta_inferior(board, color, stats):
+    ordering = InferiorCellFilter(KillerHistoryOrdering())
+    ordering.new_search(board)
+    alphabeta(board, ALPHABETA_DEPTH, float('-inf'), float('inf'), True, color,
+              eval_advanced, ordering, stats=stats)
+
+
+def _run_pvs_inferior(board, color, stats):
+    ordering = InferiorCellFilter(KillerHistoryOrdering())
+    ordering.new_search(board)
+    pvs(board, ALPHABETA_DEPTH, float('-inf'), float('inf'), color, color,
+        eval_advanced, ordering, stats=stats)
+
+
+SEARCH_BENCHMARKS = {
+    'minimax': (_run_minimax, MINIMAX_MAX_SIZE),
+    'alphabeta': (_run_alphabeta, ALPHABETA_MAX_SIZE),
+    'alphabeta_killer': (_run_alphabeta_killer, ALPHABETA_MAX_SIZE),
+    'alphabeta_inferior': (_run_alphabeta_inferior, ALPHABETA_MAX_SIZE),
+    'pvs_inferior': (_run_pvs_inferior, ALPHABETA_MAX_SIZE),
+}
+
+
+def run_benchmarks(sizes=SIZES, only=None, log=print):
+    """Run the suite and return the JSON-ready result dict."""
+    corpus = build_corpus(sizes)
+    results = {}
+    for size, positions in corpus.items():
+        for name, fn_for_position in MICRO_BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            results[f"{name}/{size}"] = res = _micro(fn_for_position, positions)
+            log(f"  {name + '/' + str(size):<34} {res['time_per_call'] * 1e6:>12.1f} us/call")
+        for name, (run, max_size) in SEARCH_BENCHMARKS.items():
+            if (only and name not in only) or size > max_size:
+                continue
+            results[f"{name}/{size}"] = res = _search(run, positions)
+            log(f"  {name + '/' + str(size):<34} {res['time_per_call'] * 1e3:>12.1f} ms/call"
+                f"  {res['nodes']:>8} nodes  {res['nodes_per_sec']:>9.0f} nodes/s")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': list(sizes),
+            'positions_per_size': POSITIONS_PER_SIZE,
+            'fill': FILL,
+        },
+        'results': results,
+    }
+
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD, log=print):
+    """Print time-per-call ratios between two runs; return the regressed keys."""
+    regressions = []
+    log(f"  {'benchmark':<34} {'old':>12} {'new':>12} {'ratio':>7}")
+    for key in sorted(set(old['results']) & set(new['results'])):
+        a = old['results'][key]['time_per_call']
+        b = new['results'][key]['time_per_call']
+        ratio = b / a if a else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  SLOWER'
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        log(f"  {key:<34} {a * 1e6:>10.1f}us {b * 1e6:>10.1f}us {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search and evaluation hot paths.")
+    parser.add_argument('--out', help="write results JSON to this file")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--only', nargs='+', help="benchmark names to run")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two result files instead of running")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        regressions = compare(old, new, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower by more than {args.threshold:.0%}")
+            sys.exit(1)
+        return
+
+    report = run_benchmarks(args.sizes, args.only)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"\nResults written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
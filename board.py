@@ -1,90 +1,348 @@
 """Hex board representation, move logic, win detection, and display."""
 
-from collections import deque
+import random
 from utils import EMPTY, RED, BLUE, PLAYER_SYMBOLS, col_label
 
 # Six hex-grid neighbor offsets
 NEIGHBOR_OFFSETS = [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0)]
 
+# Symmetries of the Hex board, each its own inverse. The swap transforms
+# transpose the board and exchange the colors: RED connecting top-bottom
+# on a grid is BLUE connecting left-right on its transpose.
+IDENTITY, ROT180, SWAP, SWAP_ROT180 = range(4)
+
+_ZOBRIST_CACHE = {}
+_SYMMETRY_CACHE = {}
+_NEIGHBOR_CACHE = {}
+_EDGE_CACHE = {}
+
+
+def neighbor_table(size):
+    """Flat-index adjacency for a board size, built once per size.
+
+    Entry i < size*size is a tuple of the on-board neighbours of cell i.
+    The four entries after the cells are the virtual edge nodes, in the
+    order of ``HexBoard.top``, ``bottom``, ``left`` and ``right``, each
+    listing the cells along its edge.
+    """
+    table = _NEIGHBOR_CACHE.get(size)
+    if table is None:
+        n = size
+        cells = [
+            tuple((r + dr) * n + c + dc for dr, dc in NEIGHBOR_OFFSETS
+                  if 0 <= r + dr < n and 0 <= c + dc < n)
+            for r in range(n) for c in range(n)
+        ]
+        edges = [
+            tuple(range(0, n)),                     # top row
+            tuple(range(n * (n - 1), n * n)),       # bottom row
+            tuple(range(0, n * n, n)),              # left column
+            tuple(range(n - 1, n * n, n)),          # right column
+        ]
+        table = _NEIGHBOR_CACHE[size] = tuple(cells + edges)
+    return table
+
+
+def edge_table(size):
+    """Virtual edge nodes each cell touches, per color.
+
+    Maps RED and BLUE to a tuple indexed by flat cell index, holding the
+    ids of that color's edge nodes (see ``neighbor_table``) adjacent to the cell.
+    """
+    table = _EDGE_CACHE.get(size)
+    if table is None:
+        n = size
+        n2 = n * n
+        top, bottom, left, right = n2, n2 + 1, n2 + 2, n2 + 3
+        table = _EDGE_CACHE[size] = {
+            RED: tuple(
+                ((top,) if i < n else ()) + ((bottom,) if i >= n2 - n else ())
+                for i in range(n2)
+            ),
+            BLUE: tuple(
+                ((left,) if i % n == 0 else ()) + ((right,) if i % n == n - 1 else ())
+                for i in range(n2)
+            ),
+        }
+    return table
+
+
+def zobrist_keys(size):
+    """Return per-cell 64-bit Zobrist keys for a board size.
+
+    The result maps each color to a list indexed by flat cell index. Keys
+    are drawn from a fixed seed so hashes agree across processes and runs.
+    """
+    keys = _ZOBRIST_CACHE.get(size)
+    if keys is None:
+        rng = random.Random(0x5EED0000 + size)
+        n2 = size * size
+        keys = {
+            RED: [rng.getrandbits(64) for _ in range(n2)],
+            BLUE: [rng.getrandbits(64) for _ in range(n2)],
+        }
+        _ZOBRIST_CACHE[size] = keys
+    return keys
+
+
+def transform_index(idx, transform, size):
+    """Map a flat cell index through a board symmetry."""
+    if transform == IDENTITY:
+        return idx
+    if transform == ROT180:
+        return size * size - 1 - idx
+    r, c = divmod(idx, size)
+    if transform == SWAP:
+        return c * size + r
+    return (size - 1 - c) * size + (size - 1 - r)
+
+
+def transform_move(move, transform, size):
+    """Map a (row, col) move through a board symmetry."""
+    return divmod(transform_index(move[0] * size + move[1], transform, size), size)
+
+
+def transform_color(color, transform):
+    """Color a stone of color becomes under a board symmetry."""
+    if transform >= SWAP and color != EMPTY:
+        return BLUE if color == RED else RED
+    return color
+
+
+def symmetry_keys(size):
+    """Zobrist keys of the transformed boards, for incremental hashing.
+
+    Maps each color to (rot180, swap, swap_rot180) lists indexed by flat
+    cell index: the key the stone contributes to that transformed board.
+    """
+    keys = _SYMMETRY_CACHE.get(size)
+    if keys is None:
+        zobrist = zobrist_keys(size)
+        n2 = size * size
+        keys = {
+            color: tuple(
+                [zobrist[transform_color(color, t)][transform_index(i, t, size)] for i in range(n2)]
+                for t in (ROT180, SWAP, SWAP_ROT180)
+            )
+            for color in (RED, BLUE)
+        }
+        _SYMMETRY_CACHE[size] = keys
+    return keys
+
 
 class HexBoard:
-    """N x N Hex board."""
+    """N x N Hex board.
+
+    Stones are stored in a flat row-major ``bytearray`` (``cells``), indexed
+    by ``row * size + col``. Search code drives the board in place with
+    ``play``/``undo`` instead of cloning it for every child node.
+
+    Connectivity is tracked incrementally in a union-find over the cells
+    plus four virtual edge nodes (RED top/bottom, BLUE left/right), so
+    ``check_win`` is two ``find`` calls. The union-find uses union by size
+    without path compression, which keeps every union reversible by
+    ``undo``. Always modify the board through ``place``/``play``/``undo``.
+    Adjacency comes from the shared per-size ``neighbor_table`` and
+    ``edge_table``, which graph code elsewhere should use as well.
+
+    ``hash`` is the Zobrist hash of the stones on the board, updated
+    incrementally by ``play`` and ``undo``, along with the hashes of the
+    board's three symmetric images (see ``canonical``).
+    """
 
     def __init__(self, size=11):
         self.size = size
-        self.grid = [[EMPTY] * size for _ in range(size)]
+        self.cells = bytearray(size * size)
+        self.history = []  # flat indices of played stones, most recent last
+        self.hash = 0
+        self._zobrist = zobrist_keys(size)
+        self._sym_hashes = [0, 0, 0]     # hashes under ROT180, SWAP, SWAP_ROT180
+        self._sym_zobrist = symmetry_keys(size)
+        self._neighbors = neighbor_table(size)
+        self._edges = edge_table(size)
+
+        n2 = size * size
+        self.top, self.bottom, self.left, self.right = n2, n2 + 1, n2 + 2, n2 + 3
+        self._parent = list(range(n2 + 4))
+        self._set_size = [1] * (n2 + 4)
+        self._links = []        # roots attached by each union, for rollback
+        self._link_counts = []  # number of unions made by each played stone
+
+    @property
+    def grid(self):
+        """Row-major snapshot of the board as a list of lists.
+
+        Kept for callers that index ``grid[row][col]``; writing to the
+        returned lists does not modify the board.
+        """
+        n = self.size
+        cells = self.cells
+        return [list(cells[r * n:(r + 1) * n]) for r in range(n)]
 
     def clone(self):
         """Return a deep copy of this board."""
-        new = HexBoard(self.size)
-        new.grid = [row[:] for row in self.grid]
+        new = HexBoard.__new__(HexBoard)
+        new.size = self.size
+        new.cells = self.cells[:]
+        new.history = self.history[:]
+        new.hash = self.hash
+        new._zobrist = self._zobrist
+        new._sym_hashes = self._sym_hashes[:]
+        new._sym_zobrist = self._sym_zobrist
+        new._neighbors = self._neighbors
+        new._edges = self._edges
+        new.top, new.bottom, new.left, new.right = self.top, self.bottom, self.left, self.right
+        new._parent = self._parent[:]
+        new._set_size = self._set_size[:]
+        new._links = self._links[:]
+        new._link_counts = self._link_counts[:]
         return new
 
+    def encode(self):
+        """Compact bytes form: the size, then each played stone in order.
+
+        Each stone takes two bytes (cell index and color packed together),
+        so a 19x19 position is at most 723 bytes.
+        """
+        cells = self.cells
+        out = bytearray([self.size])
+        for idx in self.history:
+            out += ((idx << 1) | (cells[idx] == BLUE)).to_bytes(2, 'big')
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        """Rebuild a board (including its move history) from ``encode`` output."""
+        board = cls(data[0])
+        n = board.size
+        for i in range(1, len(data), 2):
+            packed = int.from_bytes(data[i:i + 2], 'big')
+            row, col = divmod(packed >> 1, n)
+            board.play(row, col, BLUE if packed & 1 else RED)
+        return board
+
+    def __reduce__(self):
+        # Pickle via the compact encoding rather than the internal tables
+        return (HexBoard.decode, (self.encode(),))
+
+    def canonical(self):
+        """Return (hash, transform) for the canonical form of this position.
+
+        The canonical form is the symmetric image (identity, 180° rotation,
+        or either of those transposed with colors swapped) with the smallest
+        hash, so symmetric positions get the same hash. Map moves to and
+        from the canonical board with ``transform_move(move, transform,
+        size)`` and colors with ``transform_color``; every transform is its
+        own inverse. Note a swap transform also swaps the side to move.
+        """
+        best, transform = self.hash, IDENTITY
+        for t, h in zip((ROT180, SWAP, SWAP_ROT180), self._sym_hashes):
+            if h < best:
+                best, transform = h, t
+        return best, transform
+
     def in_bounds(self, row, col):
         """Check if (row, col) is within the board."""
         return 0 <= row < self.size and 0 <= col < self.size
 
     def get_neighbors(self, row, col):
-        """Return list of valid neighbor coordinates for a hex cell."""
-        neighbors = []
-        for dr, dc in NEIGHBOR_OFFSETS:
-            r, c = row + dr, col + dc
-            if self.in_bounds(r, c):
-                neighbors.append((r, c))
-        return neighbors
+        """Return list of valid neighbor coordinates for a hex cell.
+
+        Hot loops should index ``neighbor_table(size)`` with flat indices
+        instead of building these lists.
+        """
+        n = self.size
+        return [divmod(v, n) for v in self._neighbors[row * n + col]]
 
     def place(self, row, col, player):
         """Place a stone. Returns True if successful, False if cell is occupied."""
         if not self.in_bounds(row, col):
             return False
-        if self.grid[row][col] != EMPTY:
+        if self.cells[row * self.size + col] != EMPTY:
             return False
-        self.grid[row][col] = player
+        self.play(row, col, player)
+        return True
+
+    def play(self, row, col, player):
+        """Place a stone without validation so it can be retracted by ``undo``.
+
+        The cell must be on the board and empty.
+        """
+        n = self.size
+        idx = row * n + col
+        cells = self.cells
+        cells[idx] = player
+        self.history.append(idx)
+        self.hash ^= self._zobrist[player][idx]
+        sym = self._sym_hashes
+        rot_keys, swap_keys, swap_rot_keys = self._sym_zobrist[player]
+        sym[0] ^= rot_keys[idx]
+        sym[1] ^= swap_keys[idx]
+        sym[2] ^= swap_rot_keys[idx]
+
+        links = 0
+        for nidx in self._neighbors[idx]:
+            if cells[nidx] == player and self._union(idx, nidx):
+                links += 1
+        for edge in self._edges[player][idx]:
+            if self._union(idx, edge):
+                links += 1
+        self._link_counts.append(links)
+
+    def undo(self):
+        """Remove the most recently played stone and return its (row, col)."""
+        parent = self._parent
+        set_size = self._set_size
+        links = self._links
+        for _ in range(self._link_counts.pop()):
+            child = links.pop()
+            set_size[parent[child]] -= set_size[child]
+            parent[child] = child
+        idx = self.history.pop()
+        player = self.cells[idx]
+        self.hash ^= self._zobrist[player][idx]
+        sym = self._sym_hashes
+        rot_keys, swap_keys, swap_rot_keys = self._sym_zobrist[player]
+        sym[0] ^= rot_keys[idx]
+        sym[1] ^= swap_keys[idx]
+        sym[2] ^= swap_rot_keys[idx]
+        self.cells[idx] = EMPTY
+        return divmod(idx, self.size)
+
+    def _find(self, node):
+        """Return the union-find root of node (no path compression)."""
+        parent = self._parent
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    def _union(self, a, b):
+        """Merge the sets of a and b. Returns True if they were separate."""
+        ra = self._find(a)
+        rb = self._find(b)
+        if ra == rb:
+            return False
+        if self._set_size[ra] < self._set_size[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        self._set_size[ra] += self._set_size[rb]
+        self._links.append(rb)
         return True
 
     def get_empty_cells(self):
         """Return list of all empty (row, col) positions."""
-        cells = []
-        for r in range(self.size):
-            for c in range(self.size):
-                if self.grid[r][c] == EMPTY:
-                    cells.append((r, c))
-        return cells
+        n = self.size
+        return [divmod(i, n) for i, v in enumerate(self.cells) if v == EMPTY]
 
     def check_win(self, player):
-        """Check if player has a connected path between their two sides using BFS.
+        """Check if player has a connected path between their two sides.
 
         RED connects top (row 0) to bottom (row size-1).
         BLUE connects left (col 0) to right (col size-1).
         """
-        visited = set()
-        queue = deque()
-
-        # Seed BFS from the starting side
         if player == RED:
-            for c in range(self.size):
-                if self.grid[0][c] == player:
-                    queue.append((0, c))
-                    visited.add((0, c))
-        else:  # BLUE
-            for r in range(self.size):
-                if self.grid[r][0] == player:
-                    queue.append((r, 0))
-                    visited.add((r, 0))
-
-        while queue:
-            row, col = queue.popleft()
-            # Check if we reached the target side
-            if player == RED and row == self.size - 1:
-                return True
-            if player == BLUE and col == self.size - 1:
-                return True
-            for nr, nc in self.get_neighbors(row, col):
-                if (nr, nc) not in visited and self.grid[nr][nc] == player:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
-
-        return False
+            return self._find(self.top) == self._find(self.bottom)
+        return self._find(self.left) == self._find(self.right)
 
     def display(self):
         """Print an ASCII representation of the hex board.
@@ -103,7 +361,7 @@ class HexBoard:
         for r in range(n):
             indent = " " * r
             row_label = f"{r + 1:>2}"
-            cells = "  ".join(PLAYER_SYMBOLS[self.grid[r][c]] for c in range(n))
+            cells = "  ".join(PLAYER_SYMBOLS[self.cells[r * n + c]] for c in range(n))
             print(f"{indent}{row_label}  {cells}")
 
         # Legend
@@ -0,0 +1,155 @@
+"""LRU memoisation of evaluation functions."""
+
+import random
+from collections import OrderedDict
+
+from board import transform_color, zobrist_keys
+from utils import RED, BLUE
+
+# Approximate bytes per cached position: OrderedDict slot and links plus
+# the int key and float score objects (about 165 measured with tracemalloc).
+ENTRY_BYTES = 170
+
+_rng = random.Random(0xCAC4E)
+_PLAYER_KEYS = {RED: _rng.getrandbits(64), BLUE: _rng.getrandbits(64)}
+
+
+class EvalCache:
+    """Wraps an eval_fn(board, player) with a bounded LRU cache.
+
+    Scores are keyed by the board's Zobrist hash and the player, so the
+    wrapper can be passed anywhere an eval_fn is expected. With
+    ``symmetric`` set the key is ``HexBoard.canonical`` instead, which
+    shares scores between symmetric positions; only use it for evaluations
+    that are invariant under the board symmetries (``eval_shortest_path``
+    is, ``eval_advanced`` is not).
+
+    Args:
+        eval_fn: the evaluation function to memoise
+        max_entries: number of positions kept before the least recently
+            used is evicted
+        max_bytes: optional memory ceiling; lowers max_entries to fit
+            using ENTRY_BYTES per position, but never below one entry
+        symmetric: key on the canonical form of the position
+    """
+
+    def __init__(self, eval_fn, max_entries=1 << 16, max_bytes=None, symmetric=False):
+        if max_bytes is not None:
+            max_entries = min(max_entries, max(1, int(max_bytes) // ENTRY_BYTES))
+        if max_entries < 1:
+            raise ValueError("Evaluation cache must hold at least one entry")
+        self.eval_fn = eval_fn
+        self.full_width_batch = getattr(eval_fn, 'full_width_batch', False)
+        self.max_entries = max_entries
+        self.symmetric = symmetric
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, board, player):
+        if self.symmetric:
+            h, transform = board.canonical()
+            return h ^ _PLAYER_KEYS[transform_color(player, transform)]
+        return board.hash ^ _PLAYER_KEYS[player]
+
+    def __call__(self, board, player):
+        key = self._key(board, player)
+        entries = self._entries
+        score = entries.get(key)
+        if score is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return score
+        self.misses += 1
+        score = entries[key] = self.eval_fn(board, player)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return score
+
+    def batch(self, board, moves, color, player):
+        """Scores for player after each of color's moves, cached like ``__call__``.
+
+        Misses are passed in one call to the wrapped function's own
+        ``batch`` method if it has one, and evaluated one by one otherwise.
+        """
+        entries = self._entries
+        n = board.size
+        if self.symmetric:
+            keys = []
+            for r, c in moves:
+                board.play(r, c, color)
+                keys.append(self._key(board, player))
+                board.undo()
+        else:
+            zobrist = zobrist_keys(n)[color]
+            base = board.hash ^ _PLAYER_KEYS[player]
+            keys = [base ^ zobrist[r * n + c] for r, c in moves]
+
+        scores = []
+        missing = []
+        for i, key in enumerate(keys):
+            score = entries.get(key)
+            if score is not None:
+                entries.move_to_end(key)
+            else:
+                missing.append(i)
+            scores.append(score)
+        self.hits += len(moves) - len(missing)
+        self.misses += len(missing)
+        if not missing:
+            return scores
+
+        inner_batch = getattr(self.eval_fn, 'batch', None)
+        if inner_batch is not None:
+            computed = inner_batch(board, [moves[i] for i in missing], color, player)
+        else:
+            computed = []
+            for i in missing:
+                r, c = moves[i]
+                board.play(r, c, color)
+                computed.append(self.eval_fn(board, player))
+                board.undo()
+        for i, score in zip(missing, computed):
+            scores[i] = entries[keys[i]] = score
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.evictions += 1
+        return scores
+
+    def __getstate__(self):
+        # Ship the wrapper to worker processes without its contents
+        state = self.__dict__.copy()
+        state['_entries'] = OrderedDict()
+        return state
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        self._entries.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Return the hit/miss/eviction counters as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def summary(self):
+        """One-line human-readable statistics."""
+        s = self.stats()
+        return (f"eval cache: {s['hits']} hits, {s['misses']} misses, "
+                f"{s['entries']} entries ({s['hit_rate']:.1%} hit rate)")
@@ -1,8 +1,13 @@
 """Evaluation heuristics for Hex AI players."""
 
-import heapq
+import math
 import random
-from utils import RED, BLUE, opponent
+import threading
+from collections import deque
+from board import NEIGHBOR_OFFSETS, neighbor_table
+from utils import EMPTY, RED, BLUE, opponent
+
+INF = float('inf')
 
 
 def eval_simple(board, player):
@@ -11,69 +16,251 @@ def eval_simple(board, player):
     Used by Easy AI. Positive = good for player.
     """
     opp = opponent(player)
-    my_stones = 0
-    opp_stones = 0
-    for r in range(board.size):
-        for c in range(board.size):
-            if board.grid[r][c] == player:
-                my_stones += 1
-            elif board.grid[r][c] == opp:
-                opp_stones += 1
+    my_stones = board.cells.count(player)
+    opp_stones = board.cells.count(opp)
     return (my_stones - opp_stones) + random.uniform(-0.5, 0.5)
 
 
+class PathCostEngine:
+    """Shortest-path costs for one board size, using 0-1 BFS on flat buffers.
+
+    Cost model (as in ``_shortest_path_cost``): entering an own stone costs
+    0, an empty cell 1, and opponent stones are impassable. Because every
+    step costs 0 or 1, a deque replaces Dijkstra's heap. The distance
+    buffer, queue and neighbour table are allocated once and reused by
+    every call, so an engine is not safe to share between threads.
+
+    ``compute`` keeps a full distance field for one player, and
+    ``cost_with_stone`` answers "what if the player also had this cell"
+    from it incrementally, without disturbing it. Code that keeps a field
+    across other evaluations should own its engine: the shared engines
+    from ``path_engine`` are overwritten by every ``_shortest_path_cost``.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        n = size
+        self.neighbors = neighbor_table(size)
+        self.dist = [INF] * (n * n)
+        self._blank = [INF] * (n * n)
+        self._queue = deque()
+        self._start = {RED: range(0, n), BLUE: range(0, n * n, n)}
+        self._target = {RED: range(n * (n - 1), n * n), BLUE: range(n - 1, n * n, n)}
+        self._is_target = {
+            RED: [i >= n * (n - 1) for i in range(n * n)],
+            BLUE: [i % n == n - 1 for i in range(n * n)],
+        }
+        self.player = None  # player whose field is held in dist
+        self.cost = INF     # that player's cost, as of the last compute
+
+    def _seed(self, cells, player, from_end=False):
+        """Reset dist and queue the player's starting-side (or target-side) cells."""
+        opp = opponent(player)
+        dist = self.dist
+        dist[:] = self._blank
+        queue = self._queue
+        queue.clear()
+        for i in (self._target if from_end else self._start)[player]:
+            stone = cells[i]
+            if stone == opp:
+                continue
+            if stone == player:
+                dist[i] = 0
+                queue.appendleft(i)
+            else:
+                dist[i] = 1
+                queue.append(i)
+        return queue
+
+    def shortest(self, cells, player):
+        """Return the player's path cost, stopping at the first target cell reached."""
+        opp = opponent(player)
+        dist = self.dist
+        neighbors = self.neighbors
+        is_target = self._is_target[player]
+        queue = self._seed(cells, player)
+        self.player = None  # dist no longer holds a complete field
+
+        while queue:
+            u = queue.popleft()
+            d = dist[u]
+            if is_target[u]:
+                queue.clear()
+                return d
+            for v in neighbors[u]:
+                stone = cells[v]
+                if stone == opp:
+                    continue
+                if stone == player:
+                    if d < dist[v]:
+                        dist[v] = d
+                        queue.appendleft(v)
+                elif d + 1 < dist[v]:
+                    dist[v] = d + 1
+                    queue.append(v)
+        return INF
+
+    def compute(self, cells, player, from_end=False):
+        """Fill dist with the player's full distance field and return the path cost.
+
+        With from_end=True the field is measured from the target side
+        instead; such a field cannot be used with ``cost_with_stone``.
+        """
+        queue = self._seed(cells, player, from_end)
+        self._relax(cells, player, queue)
+        self.cost = min(self.dist[i] for i in (self._start if from_end else self._target)[player])
+        self.player = None if from_end else player
+        return self.cost
+
+    def _relax(self, cells, player, queue, log=None):
+        """Propagate lowered distances from the queued cells.
+
+        Returns the lowest distance written to a target-side cell. If log is
+        given, (cell, old distance) pairs are appended to it for rollback.
+        """
+        opp = opponent(player)
+        dist = self.dist
+        neighbors = self.neighbors
+        is_target = self._is_target[player]
+        best = INF
+        while queue:
+            u = queue.popleft()
+            d = dist[u]
+            for v in neighbors[u]:
+                stone = cells[v]
+                if stone == opp:
+                    continue
+                nd = d if stone == player else d + 1
+                if nd < dist[v]:
+                    if log is not None:
+                        log.append((v, dist[v]))
+                    dist[v] = nd
+                    if is_target[v] and nd < best:
+                        best = nd
+                    if nd == d:
+                        queue.appendleft(v)
+                    else:
+                        queue.append(v)
+        return best
+
+    def _entry_cost(self, player, idx):
+        """Lowest distance at which idx can be entered from the start side or a neighbour."""
+        dist = self.dist
+        best = 0 if idx in self._start[player] else INF
+        for v in self.neighbors[idx]:
+            if dist[v] < best:
+                best = dist[v]
+        return best
+
+    def cost_with_stone(self, cells, idx):
+        """Path cost if the player also held the empty cell idx.
+
+        Uses the field from ``compute`` and leaves it unchanged.
+        """
+        player = self.player
+        dist = self.dist
+        d = self._entry_cost(player, idx)
+        if d >= dist[idx]:
+            return self.cost
+        log = [(idx, dist[idx])]
+        dist[idx] = d
+        best = d if self._is_target[player][idx] else INF
+        queue = self._queue
+        queue.append(idx)
+        best = min(best, self._relax(cells, player, queue, log))
+        for v, old in reversed(log):
+            dist[v] = old
+        return min(self.cost, best)
+
+
+# Engines keep their search state between calls, so each thread gets its own
+_PATH_ENGINES = threading.local()
+
+
+def path_engine(size):
+    """Return this thread's shared PathCostEngine for a board size."""
+    engines = getattr(_PATH_ENGINES, 'by_size', None)
+    if engines is None:
+        engines = _PATH_ENGINES.by_size = {}
+    engine = engines.get(size)
+    if engine is None:
+        engine = engines[size] = PathCostEngine(size)
+    return engine
+
+
 def _shortest_path_cost(board, player):
-    """Dijkstra shortest path cost for player to connect their two sides.
+    """Shortest path cost for player to connect their two sides.
 
     Cost: own stone = 0, empty cell = 1, opponent stone = impassable.
     Returns the minimum number of empty cells needed to complete a path.
     Returns float('inf') if no path exists (fully blocked).
     """
-    n = board.size
-    opp = opponent(player)
-    INF = float('inf')
+    return path_engine(board.size).shortest(board.cells, player)
 
-    dist = [[INF] * n for _ in range(n)]
-    heap = []
 
-    # Seed from starting side
-    if player == RED:
-        # RED connects top (row 0) to bottom (row n-1)
-        for c in range(n):
-            if board.grid[0][c] == opp:
-                continue
-            cost = 0 if board.grid[0][c] == player else 1
-            if cost < dist[0][c]:
-                dist[0][c] = cost
-                heapq.heappush(heap, (cost, 0, c))
-    else:
-        # BLUE connects left (col 0) to right (col n-1)
-        for r in range(n):
-            if board.grid[r][0] == opp:
-                continue
-            cost = 0 if board.grid[r][0] == player else 1
-            if cost < dist[r][0]:
-                dist[r][0] = cost
-                heapq.heappush(heap, (cost, r, 0))
-
-    while heap:
-        d, r, c = heapq.heappop(heap)
-        if d > dist[r][c]:
-            continue
-        # Check if we reached the target side
-        if player == RED and r == n - 1:
-            return d
-        if player == BLUE and c == n - 1:
-            return d
-        for nr, nc in board.get_neighbors(r, c):
-            if board.grid[nr][nc] == opp:
-                continue
-            nd = d + (0 if board.grid[nr][nc] == player else 1)
-            if nd < dist[nr][nc]:
-                dist[nr][nc] = nd
-                heapq.heappush(heap, (nd, nr, nc))
+def stone_path_costs(board, player):
+    """Player's path cost after an own stone on each cell, for every cell at once.
+
+    Uses two distance fields, one from each of the player's sides. Both
+    include the cost of the cell itself, so a path forced through empty
+    cell x costs ``from_start[x] + from_end[x] - 2`` once x holds an own
+    stone. Paths avoiding x keep the current cost. This gives exactly the
+    value ``_shortest_path_cost`` would return after placing the stone.
+
+    Returns a flat list indexed like ``board.cells``; occupied cells hold
+    the current cost.
+    """
+    engine = path_engine(board.size)
+    cells = board.cells
+    engine.compute(cells, player, from_end=True)
+    from_end = engine.dist[:]
+    base = engine.compute(cells, player)
+    from_start = engine.dist
+    return [
+        base if stone else min(base, a + b - 2)
+        for stone, a, b in zip(cells, from_start, from_end)
+    ]
+
+
+def blocked_path_costs(board, player):
+    """Player's path cost after an opponent stone on each cell, for every cell at once.
 
-    return INF
+    Blocking a cell that lies on none of the player's shortest paths
+    leaves the cost unchanged, so only cells on a shortest path (where
+    ``from_start[x] + from_end[x] - 1`` equals the cost) are searched
+    again with the cell blocked.
+
+    Returns a flat list indexed like ``board.cells``; occupied cells hold
+    the current cost.
+    """
+    engine = path_engine(board.size)
+    cells = board.cells
+    engine.compute(cells, player, from_end=True)
+    from_end = engine.dist[:]
+    base = engine.compute(cells, player)
+    from_start = engine.dist[:]
+    opp = opponent(player)
+    costs = [base] * len(cells)
+    if base == INF:
+        return costs
+    scratch = cells[:]          # never write to the board's own cells
+    for x, stone in enumerate(cells):
+        if not stone and from_start[x] + from_end[x] - 1 == base:
+            scratch[x] = opp
+            costs[x] = engine.shortest(scratch, player)
+            scratch[x] = EMPTY
+    return costs
+
+
+def _sibling_path_costs(board, moves, color, player):
+    """Both players' path costs after each of color's moves, as two lists."""
+    n = board.size
+    mover = stone_path_costs(board, color)
+    other = blocked_path_costs(board, opponent(color))
+    indices = [r * n + c for r, c in moves]
+    mover = [mover[i] for i in indices]
+    other = [other[i] for i in indices]
+    return (mover, other) if color == player else (other, mover)
 
 
 def eval_shortest_path(board, player):
@@ -87,30 +274,30 @@ def eval_shortest_path(board, player):
     return opp_cost - my_cost
 
 
+def _batch_shortest_path(board, moves, color, player):
+    """``eval_shortest_path`` after each of color's moves, from shared distance fields."""
+    my_costs, opp_costs = _sibling_path_costs(board, moves, color, player)
+    return [opp_cost - my_cost for my_cost, opp_cost in zip(my_costs, opp_costs)]
+
+
+eval_shortest_path.batch = _batch_shortest_path
+
+
 def _count_connected_to_start(board, player):
     """Count player stones connected to their starting side via own stones."""
-    from collections import deque
     n = board.size
-    visited = set()
-    queue = deque()
-
-    if player == RED:
-        for c in range(n):
-            if board.grid[0][c] == player and (0, c) not in visited:
-                visited.add((0, c))
-                queue.append((0, c))
-    else:
-        for r in range(n):
-            if board.grid[r][0] == player and (r, 0) not in visited:
-                visited.add((r, 0))
-                queue.append((r, 0))
-
-    while queue:
-        r, c = queue.popleft()
-        for nr, nc in board.get_neighbors(r, c):
-            if (nr, nc) not in visited and board.grid[nr][nc] == player:
-                visited.add((nr, nc))
-                queue.append((nr, nc))
+    cells = board.cells
+    neighbors = neighbor_table(n)
+    # The start side's virtual edge node lists the cells along that edge
+    stack = [i for i in neighbors[n * n if player == RED else n * n + 2] if cells[i] == player]
+    visited = set(stack)
+
+    while stack:
+        u = stack.pop()
+        for v in neighbors[u]:
+            if v not in visited and cells[v] == player:
+                visited.add(v)
+                stack.append(v)
 
     return len(visited)
 
@@ -132,3 +319,414 @@ def eval_advanced(board, player):
     connectivity_bonus = (my_connected - opp_connected) * 0.3
 
     return path_score + connectivity_bonus
+
+
+def _connected_after_stone(board, player, moves):
+    """``_count_connected_to_start`` after a player stone on each move's cell.
+
+    A new stone joins the start-connected group if it touches the start
+    side or that group, and then brings every other own group it touches
+    along with it.
+    """
+    n = board.size
+    cells = board.cells
+    neighbors = neighbor_table(n)
+    start_edge = neighbors[n * n if player == RED else n * n + 2]
+    on_start_edge = set(start_edge)
+
+    # Label the player's groups; group 0 holds the stones connected to the start side
+    group = {}
+    sizes = [0]
+    seeds = [i for i in start_edge if cells[i] == player]
+    seeds += [i for i, v in enumerate(cells) if v == player and i not in on_start_edge]
+    for seed in seeds:
+        if seed in group:
+            continue
+        label = 0 if seed in on_start_edge else len(sizes)
+        if label:
+            sizes.append(0)
+        group[seed] = label
+        stack = [seed]
+        while stack:
+            u = stack.pop()
+            sizes[label] += 1
+            for v in neighbors[u]:
+                if v not in group and cells[v] == player:
+                    group[v] = label
+                    stack.append(v)
+    connected = sizes[0]
+
+    result = []
+    for r, c in moves:
+        x = r * n + c
+        touching = {group[v] for v in neighbors[x] if v in group}
+        if x in on_start_edge or 0 in touching:
+            touching.discard(0)
+            result.append(connected + 1 + sum(sizes[g] for g in touching))
+        else:
+            result.append(connected)
+    return result
+
+
+def _batch_advanced(board, moves, color, player):
+    """``eval_advanced`` after each of color's moves, from shared distance fields."""
+    opp = opponent(player)
+    my_costs, opp_costs = _sibling_path_costs(board, moves, color, player)
+    if color == player:
+        my_connected = _connected_after_stone(board, player, moves)
+        opp_connected = [_count_connected_to_start(board, opp)] * len(moves)
+    else:
+        my_connected = [_count_connected_to_start(board, player)] * len(moves)
+        opp_connected = _connected_after_stone(board, opp, moves)
+    scores = []
+    for my_cost, opp_cost, mine, theirs in zip(my_costs, opp_costs, my_connected, opp_connected):
+        path_score = opp_cost - my_cost
+        connectivity_bonus = (mine - theirs) * 0.3
+        scores.append(path_score + connectivity_bonus)
+    return scores
+
+
+eval_advanced.batch = _batch_advanced
+
+
+class ResistanceNetwork:
+    """Electrical resistance of a player's connection, for one board size.
+
+    Each cell is a resistor: 1 for an empty cell, ``OWN_RESISTANCE`` for
+    an own stone, and opponent stones are cut out. Adjacent cells are
+    joined by a conductance of 1 / (r_a + r_b) and the cells along the
+    player's two sides are joined to a source at voltage 1 and a sink at
+    voltage 0. The effective resistance between source and sink measures
+    how well the player is connected, counting every path rather than
+    only the shortest one (Shannon, Anshelevich).
+
+    The node voltages solve a sparse symmetric positive definite system.
+    With cells numbered row-major every edge joins cells at most ``size``
+    apart, so the matrix is a band of half-width ``size`` and is solved
+    exactly by a banded LDL^T factorisation in O(cells * size^2). The
+    edge list and band layout are built once per size and reused; cells
+    that cannot reach the source are left out of the system.
+
+    ``sibling_resistances`` solves all the children of one position: the
+    parent's reachability and assembled system are built once and each
+    child only redoes the rows around its new stone.
+    """
+
+    OWN_RESISTANCE = 1e-3
+
+    def __init__(self, size):
+        self.size = size
+        n = size
+        self.n2 = n * n
+        self.width = n
+        # Undirected edges (i, j, j - i) with j > i; j - i is 1, n - 1 or n
+        self.edges = [
+            (i, i + d, d)
+            for i in range(n * n)
+            for d in sorted({1, n - 1, n})
+            if self._adjacent(i, i + d)
+        ]
+        self.neighbors = neighbor_table(size)
+        # Ascending, which is the order the edge loop adds to a diagonal
+        self._sorted_neighbors = [tuple(sorted(self.neighbors[i])) for i in range(n * n)]
+        self._blank = [[0.0] * (n + 1) for _ in range(n * n)]
+        self._start = {RED: range(0, n), BLUE: range(0, n * n, n)}
+        self._is_target = {
+            RED: [i >= n * (n - 1) for i in range(n * n)],
+            BLUE: [i % n == n - 1 for i in range(n * n)],
+        }
+
+    def _adjacent(self, i, j):
+        n = self.size
+        if j >= n * n:
+            return False
+        (r1, c1), (r2, c2) = divmod(i, n), divmod(j, n)
+        return (r2 - r1, c2 - c1) in NEIGHBOR_OFFSETS
+
+    def _reachable(self, cells, player):
+        """Cells connected to the player's start side through non-opponent cells."""
+        opp = opponent(player)
+        neighbors = self.neighbors
+        stack = [i for i in self._start[player] if cells[i] != opp]
+        seen = bytearray(self.n2)
+        for i in stack:
+            seen[i] = 1
+        while stack:
+            u = stack.pop()
+            for v in neighbors[u]:
+                if not seen[v] and cells[v] != opp:
+                    seen[v] = 1
+                    stack.append(v)
+        return seen
+
+    def _connects(self, live, player):
+        is_target = self._is_target[player]
+        return any(live[i] for i in range(self.n2) if is_target[i])
+
+    def resistance(self, cells, player):
+        """Effective resistance between the player's two sides (inf if cut off)."""
+        live = self._reachable(cells, player)
+        if not self._connects(live, player):
+            return INF
+        band, rhs, source = self._system(cells, player, live)
+        return self._current(band, rhs, source)
+
+    def _system(self, cells, player, live):
+        """Assemble (band, rhs, source conductances) for the live cells."""
+        is_target = self._is_target[player]
+        own_r = self.OWN_RESISTANCE
+        res = [own_r if stone == player else 1.0 for stone in cells]
+        band = [row[:] for row in self._blank]
+        rhs = [0.0] * self.n2
+
+        for i, j, d in self.edges:
+            if live[i] and live[j]:
+                g = 1.0 / (res[i] + res[j])
+                band[i][0] += g
+                band[j][0] += g
+                band[i][d] = -g
+        source = {}
+        for i in self._start[player]:
+            if live[i]:
+                g = 1.0 / res[i]
+                source[i] = g
+                band[i][0] += g
+                rhs[i] = g
+        for i in range(self.n2):
+            if live[i] and is_target[i]:
+                band[i][0] += 1.0 / res[i]
+            elif not live[i]:
+                band[i][0] = 1.0     # left out: v = 0, no coupling
+        return band, rhs, source
+
+    def _current(self, band, rhs, source):
+        """Solve the assembled system (consuming it) and return the resistance."""
+        voltage = self._solve(band, rhs)
+        current = sum(g * (1.0 - voltage[i]) for i, g in source.items())
+        return 1.0 / current if current > 0 else INF
+
+    def sibling_resistances(self, cells, player, indices, color):
+        """Player's resistance after a color stone on each of the empty cells indices.
+
+        Gives exactly what ``resistance`` gives on each child. A child's
+        system differs from the parent's only in the rows of the new stone
+        and its neighbours, so every elimination step before the first of
+        those rows is the parent's: one parent factorisation is advanced
+        through the children in row order, and each child copies it and
+        only replays the parent's earlier pivots on its own changed rows.
+        A stone outside the player's live cells leaves the resistance
+        unchanged, and an opponent stone that cuts off more than its own
+        cell falls back to a full solve.
+        """
+        live = self._reachable(cells, player)
+        if not self._connects(live, player):
+            return [INF] * len(indices)
+        opp = opponent(player)
+        band, rhs, source = self._system(cells, player, live)
+        work = bytearray(cells)      # scratch copy for the children
+        res = [self.OWN_RESISTANCE if stone == player else 1.0 for stone in cells]
+        live_count = live.count(1)
+        results = [None] * len(indices)
+        unchanged = []
+        children = []                # (first changed row, result slot, rows, rhs, source)
+        for slot, idx in enumerate(indices):
+            if not live[idx]:
+                unchanged.append(slot)
+                continue
+            work[idx] = color
+            child_live = live
+            if color == opp:
+                child_live = self._reachable(work, player)
+                if child_live.count(1) != live_count - 1:
+                    results[slot] = self.resistance(work, player)
+                elif not self._connects(child_live, player):
+                    results[slot] = INF
+            else:
+                res[idx] = self.OWN_RESISTANCE
+            if results[slot] is None:
+                rows, child_rhs, child_source = self._patch(band, rhs, source, player, idx,
+                                                            child_live, res)
+                children.append((min(rows), slot, rows, child_rhs, child_source))
+            res[idx] = 1.0
+            work[idx] = 0
+
+        w = self.width
+        n2 = self.n2
+        parent = [row[:] for row in band]
+        pivots = [None] * n2
+        done = 0
+        children.sort(key=lambda child: (child[0], child[1]))
+        for first, slot, rows, child_rhs, child_source in children:
+            self._factor(parent, done, first, pivots)
+            done = first
+            child = [row[:] for row in parent]
+            for t, row in rows.items():
+                # The updates the parent's pivots before first made to row t
+                for k in range(max(0, t - w), first):
+                    pivot_row = pivots[k]
+                    d = t - k
+                    a = pivot_row[d]
+                    if a == 0.0:
+                        continue
+                    f = a / pivot_row[0]
+                    for e in range(w - d + 1):
+                        row[e] -= f * pivot_row[d + e]
+                child[t] = row
+            self._factor(child, first, n2)
+            results[slot] = self._current_factored(child, child_rhs, child_source)
+        if unchanged:
+            self._factor(parent, done, n2)
+            resistance = self._current_factored(parent, rhs, source)
+            for slot in unchanged:
+                results[slot] = resistance
+        return results
+
+    def _patch(self, band, rhs, source, player, idx, live, res):
+        """The rows of the parent system that change for a child, rebuilt.
+
+        Returns ({row index: row}, rhs, source) for the child; rows not in
+        the dict equal the parent's.
+        """
+        rows = {}
+        rhs = rhs[:]
+        source = dict(source)
+        is_start = self._start[player]
+        is_target = self._is_target[player]
+        sorted_neighbors = self._sorted_neighbors
+        for k in (idx,) + sorted_neighbors[idx]:
+            rows[k] = band[k][:]
+        for v in sorted_neighbors[idx]:
+            i, j = (v, idx) if v < idx else (idx, v)
+            rows[i][j - i] = -1.0 / (res[i] + res[j]) if live[i] and live[j] else 0.0
+        for k, row in rows.items():
+            if not live[k]:
+                row[0] = 1.0
+                rhs[k] = 0.0
+                source.pop(k, None)
+                continue
+            rk = res[k]
+            total = 0.0
+            for v in sorted_neighbors[k]:
+                if live[v]:
+                    total += 1.0 / (rk + res[v])
+            if k in is_start:
+                g = 1.0 / rk
+                source[k] = g
+                rhs[k] = g
+                total += g
+            if is_target[k]:
+                total += 1.0 / rk
+            row[0] = total
+        return rows, rhs, source
+
+    def _current_factored(self, band, rhs, source):
+        """Resistance from a factorised system; rhs is left unchanged."""
+        voltage = self._substitute(band, rhs[:])
+        current = sum(g * (1.0 - voltage[i]) for i, g in source.items())
+        return 1.0 / current if current > 0 else INF
+
+    def _solve(self, band, rhs):
+        """Solve the banded SPD system in place by LDL^T; returns the solution.
+
+        band[i][d] holds A[i][i + d] for 0 <= d <= width.
+        """
+        self._factor(band, 0, self.n2)
+        return self._substitute(band, rhs)
+
+    def _factor(self, band, start, stop, pivots=None):
+        """Run the elimination steps start..stop-1 of the LDL^T factorisation.
+
+        band[k][d] becomes L[k + d][k] and band[k][0] stays D[k]. With
+        pivots, each row is saved to pivots[k] just before its step.
+        """
+        n2 = self.n2
+        w = self.width
+        for k in range(start, stop):
+            row = band[k]
+            if pivots is not None:
+                pivots[k] = row[:]
+            pivot = row[0]
+            for d in range(1, min(w, n2 - 1 - k) + 1):
+                a = row[d]
+                if a == 0.0:
+                    continue
+                f = a / pivot
+                target = band[k + d]
+                for e in range(w - d + 1):
+                    target[e] -= f * row[d + e]
+                row[d] = f
+
+    def _substitute(self, band, y):
+        """Solve with a factorised band, overwriting y with the solution."""
+        n2 = self.n2
+        w = self.width
+        # Forward substitution with L, then scale by D
+        for k in range(n2):
+            yk = y[k]
+            if yk != 0.0:
+                row = band[k]
+                for d in range(1, min(w, n2 - 1 - k) + 1):
+                    y[k + d] -= row[d] * yk
+            y[k] = yk / band[k][0]
+        # Back substitution with L^T
+        for k in range(n2 - 1, -1, -1):
+            row = band[k]
+            total = y[k]
+            for d in range(1, min(w, n2 - 1 - k) + 1):
+                total -= row[d] * y[k + d]
+            y[k] = total
+        return y
+
+
+_RESISTANCE_NETWORKS = {}
+
+
+def resistance_network(size):
+    """Return the shared ResistanceNetwork for a board size."""
+    network = _RESISTANCE_NETWORKS.get(size)
+    if network is None:
+        network = _RESISTANCE_NETWORKS[size] = ResistanceNetwork(size)
+    return network
+
+
+RESISTANCE_DECIDED = 100.0   # score when one side is cut off entirely
+
+
+def eval_resistance(board, player):
+    """Resistance-network evaluation: log of opponent's over player's resistance.
+
+    Positive = good for player. Symmetric under the board symmetries, so
+    it can be cached with ``EvalCache(..., symmetric=True)``.
+    """
+    network = resistance_network(board.size)
+    mine = network.resistance(board.cells, player)
+    theirs = network.resistance(board.cells, opponent(player))
+    return _resistance_score(mine, theirs)
+
+
+def _resistance_score(mine, theirs):
+    if mine == INF:
+        return 0.0 if theirs == INF else -RESISTANCE_DECIDED
+    if theirs == INF:
+        return RESISTANCE_DECIDED
+    return math.log(theirs / mine)
+
+
+def _batch_resistance(board, moves, color, player):
+    """``eval_resistance`` of every child of board with a color stone on one of moves.
+
+    Both players' networks are assembled once for the parent and patched
+    per child (see ``ResistanceNetwork.sibling_resistances``).
+    """
+    network = resistance_network(board.size)
+    n = board.size
+    indices = [r * n + c for r, c in moves]
+    mine = network.sibling_resistances(board.cells, player, indices, color)
+    theirs = network.sibling_resistances(board.cells, opponent(player), indices, color)
+    return [_resistance_score(m, t) for m, t in zip(mine, theirs)]
+
+
+eval_resistance.batch = _batch_resistance
+# Children cost about half a solve each even in a batch, so pruning
+# searches do better evaluating only the children they visit
+eval_resistance.full_width_batch = True
@@ -0,0 +1,251 @@
+"""Inferior-cell analysis: dead cells, captured cells and bridge responses.
+
+Every empty cell is classified from the contents of its six neighbours,
+read in ring order and packed into a base-4 "neighbourhood code"
+(EMPTY, RED, BLUE, or OFF for a corner outside both edges; other
+off-board neighbours count as a stone of the color owning that edge).
+The per-code facts are precomputed once, so classifying a cell is a table
+lookup.
+
+- A cell is useless for a color if, however its empty neighbours are
+  filled, that color's neighbours form at most one contiguous arc of the
+  ring: a path through the cell can always step around it. A cell useless
+  for both colors is dead; its color never decides the game.
+- Two adjacent empty cells are captured by a color if each is dead once
+  that color holds the other: the color answers an intrusion into one
+  with the other, so the pair is as good as its own.
+- After an intrusion into one carrier cell of a bridge, the other carrier
+  cell is the bridge owner's response.
+
+Dead cells and cells captured by the opponent of the side to move are
+pruned from move lists (``prune_moves``, ``InferiorCellFilter``) and
+captured cells are filled in before evaluation (``CapturedFillEval``).
+"""
+
+from board import NEIGHBOR_OFFSETS
+from utils import EMPTY, RED, BLUE, opponent
+
+OFF = 3
+
+# Neighbour offsets in cyclic order around a cell
+RING = [(-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1), (0, -1)]
+assert sorted(RING) == sorted(NEIGHBOR_OFFSETS)
+
+
+def _single_arc(mask):
+    """True if the set bits of a 6-bit ring mask form at most one run."""
+    runs = 0
+    for i in range(6):
+        if mask >> i & 1 and not mask >> ((i - 1) % 6) & 1:
+            runs += 1
+    return runs <= 1 or mask == 0b111111
+
+
+def _useless(digits, color):
+    """True if a stone of color on the cell can never be needed."""
+    fixed = sum(1 << i for i, d in enumerate(digits) if d == color)
+    empties = [i for i, d in enumerate(digits) if d == EMPTY]
+    for subset in range(1 << len(empties)):
+        mask = fixed
+        for bit, i in enumerate(empties):
+            if subset >> bit & 1:
+                mask |= 1 << i
+        if not _single_arc(mask):
+            return False
+    return True
+
+
+def _build_tables():
+    dead = bytearray(4 ** 6)
+    for code in range(4 ** 6):
+        digits = [code >> (2 * i) & 3 for i in range(6)]
+        dead[code] = _useless(digits, RED) and _useless(digits, BLUE)
+    bridges = {RED: [()] * 4 ** 6, BLUE: [()] * 4 ** 6}
+    captures = [()] * 4 ** 6
+    for code in range(4 ** 6):
+        digits = [code >> (2 * i) & 3 for i in range(6)]
+        for color in (RED, BLUE):
+            bridges[color][code] = tuple(
+                k for k in range(6)
+                if digits[k] == EMPTY and digits[k - 1] == color and digits[(k + 1) % 6] == color
+            )
+        if not dead[code]:
+            captures[code] = tuple(
+                (k, color) for k in range(6) for color in (RED, BLUE)
+                if digits[k] == EMPTY and dead[code + color * 4 ** k]
+            )
+    return dead, bridges, captures
+
+
+# DEAD[code]: the cell is dead. BRIDGE_SLOTS[color][code]: ring slots
+# that restore a bridge of color after the opponent played on this cell.
+# CAPTURE_SLOTS[code]: (slot, color) pairs such that the (live) cell is
+# dead once color holds the neighbour in that slot.
+DEAD, BRIDGE_SLOTS, CAPTURE_SLOTS = _build_tables()
+
+_RING_TABLES = {}
+
+
+def _ring_table(size):
+    """Per-cell (base code, on-board slots, ring) for a board size (cached).
+
+    base is the code contribution of the off-board neighbours, slots is a
+    tuple of (neighbour index, slot weight) and ring maps each slot to a
+    neighbour index or None.
+    """
+    table = _RING_TABLES.get(size)
+    if table is None:
+        n = size
+        table = []
+        for r in range(n):
+            for c in range(n):
+                base = 0
+                slots = []
+                ring = []
+                for k, (dr, dc) in enumerate(RING):
+                    nr, nc = r + dr, c + dc
+                    weight = 4 ** k
+                    row_off = not 0 <= nr < n
+                    col_off = not 0 <= nc < n
+                    if row_off and col_off:
+                        base += OFF * weight
+                        ring.append(None)
+                    elif row_off:
+                        base += RED * weight
+                        ring.append(None)
+                    elif col_off:
+                        base += BLUE * weight
+                        ring.append(None)
+                    else:
+                        slots.append((nr * n + nc, weight))
+                        ring.append(nr * n + nc)
+                table.append((base, tuple(slots), tuple(ring)))
+        _RING_TABLES[size] = table
+    return table
+
+
+def _code(cells, entry):
+    code, slots, _ = entry
+    for j, weight in slots:
+        code += cells[j] * weight
+    return code
+
+
+def analyze(board):
+    """Classify the empty cells of board.
+
+    Returns:
+        (dead, captured): a set of dead flat indices and a dict mapping
+        captured flat indices to the color that owns them
+    """
+    table = _ring_table(board.size)
+    cells = board.cells
+    codes = {i: _code(cells, table[i]) for i, v in enumerate(cells) if not v}
+    dead = set()
+    captured = {}
+    for i, code in codes.items():
+        if i in captured:
+            continue
+        if DEAD[code]:
+            dead.add(i)
+            continue
+        ring = table[i][2]
+        for k, color in CAPTURE_SLOTS[code]:
+            j = ring[k]
+            if j not in codes or j in captured or j in dead:
+                continue
+            # weight of i in j's ring is that of the opposite slot
+            if DEAD[codes[j] + color * 4 ** ((k + 3) % 6)]:
+                captured[i] = captured[j] = color
+                # Later cells are classified with the pair filled in
+                for cell in (i, j):
+                    for slot, q in enumerate(table[cell][2]):
+                        if q in codes:
+                            codes[q] += color * 4 ** ((slot + 3) % 6)
+                break
+    return dead, captured
+
+
+def bridge_responses(board):
+    """Moves that restore a bridge broken by the last move, as (row, col)."""
+    if not board.history:
+        return []
+    m = board.history[-1]
+    entry = _ring_table(board.size)[m]
+    owner = opponent(board.cells[m])
+    return [divmod(entry[2][k], board.size) for k in BRIDGE_SLOTS[owner][_code(board.cells, entry)]]
+
+
+def prune_moves(board, moves):
+    """Drop dead cells and the opponent's captured cells from moves.
+
+    Cells captured by the side to move are kept: filling one is never
+    worse than the alternatives, and it may complete a winning chain.
+    At least one move is always kept.
+    """
+    dead, captured = analyze(board)
+    if not dead and not captured:
+        return moves
+    n = board.size
+    mover = RED if len(board.history) % 2 == 0 else BLUE
+    kept = [(r, c) for r, c in moves
+            if r * n + c not in dead and captured.get(r * n + c, mover) == mover]
+    return kept or moves
+
+
+class InferiorCellFilter:
+    """move_order_fn that prunes inferior cells before ordering.
+
+    Dead cells and cells captured by the opponent of the side to move are
+    removed (see ``prune_moves``), the remaining moves are ordered
+    by the wrapped move_order_fn (if any), and responses to a bridge
+    intrusion by the last move are tried first. ``new_search`` and
+    ``record_cutoff`` are forwarded, so it can wrap a
+    ``KillerHistoryOrdering``.
+    """
+
+    def __init__(self, move_order_fn=None):
+        self.move_order_fn = move_order_fn
+
+    def __call__(self, board, moves, player):
+        moves = prune_moves(board, moves)
+        if self.move_order_fn is not None:
+            moves = self.move_order_fn(board, moves, player)
+        responses = [move for move in bridge_responses(board) if move in moves]
+        if responses:
+            moves = responses + [move for move in moves if move not in responses]
+        return moves
+
+    def new_search(self, board):
+        new_search = getattr(self.move_order_fn, 'new_search', None)
+        if new_search is not None:
+            new_search(board)
+
+    def record_cutoff(self, board, move, color, depth):
+        record_cutoff = getattr(self.move_order_fn, 'record_cutoff', None)
+        if record_cutoff is not None:
+            record_cutoff(board, move, color, depth)
+
+
+class CapturedFillEval:
+    """Evaluation wrapper that fills captured cells with their owner first.
+
+    Usable anywhere an eval_fn(board, player) is expected; picklable if
+    the wrapped function is, so it also works with RootParallelSearch.
+    """
+
+    def __init__(self, eval_fn):
+        self.eval_fn = eval_fn
+
+    def __call__(self, board, player):
+        _, captured = analyze(board)
+        if not captured:
+            return self.eval_fn(board, player)
+        n = board.size
+        for i, color in captured.items():
+            board.play(i // n, i % n, color)
+        try:
+            return self.eval_fn(board, player)
+        finally:
+            for _ in captured:
+                board.undo()
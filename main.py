@@ -1,12 +1,16 @@
 """Main entry point for the Hex game."""
 
 import time
+import tracemalloc
 from board import HexBoard
 from player import HumanPlayer
 from ai_easy import EasyAI
 from ai_medium import MediumAI
 from ai_hard import HardAI
-from utils import RED, BLUE, PLAYER_NAMES, format_move
+from ai_mcts import MCTSAI
+from ponder import PonderingPlayer
+from records import GameRecord, open_archive, write_record
+from utils import RED, BLUE, PLAYER_NAMES, format_bytes, format_move
 
 DEFAULT_SIZE = 11
 
@@ -14,16 +18,46 @@ AI_CLASSES = {
     '1': ('Easy', EasyAI),
     '2': ('Medium', MediumAI),
     '3': ('Hard', HardAI),
+    '4': ('MCTS', MCTSAI),
 }
 
 
-def play_game(player1, player2, board, display=True):
+def play_game(player1, player2, board, display=True, time_limit=None, history=None,
+              search_stats=False, track_memory=False):
     """Run a game between two players.
 
-    player1 plays RED, player2 plays BLUE.
+    player1 plays RED, player2 plays BLUE. If time_limit is given, it is
+    set as both players' per-move budget in seconds (AI players then use
+    iterative deepening instead of a fixed depth). If history is a list,
+    (color, (row, col), seconds, stats) is appended to it for every move
+    played. With search_stats=True the players collect SearchStats for
+    every move; stats is then the mover's statistics as a dict, otherwise
+    None. With track_memory=True the game runs under tracemalloc and stats
+    also holds 'peak_bytes', the most memory the move allocated at once
+    (above what was held before it), and 'held_bytes', everything
+    allocated since the game started that is still held after the move.
     Returns the winning player's color (RED or BLUE), or None if quit.
     """
     players = {RED: player1, BLUE: player2}
+    if time_limit is not None:
+        player1.time_limit = time_limit
+        player2.time_limit = time_limit
+    if search_stats:
+        player1.collect_stats = True
+        player2.collect_stats = True
+    started_tracing = track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        return _play_moves(players, board, display, history, search_stats, track_memory)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def _play_moves(players, board, display, history, search_stats, track_memory):
+    """The move loop of ``play_game``."""
+    player1, player2 = players[RED], players[BLUE]
     current_color = RED
     move_count = 0
 
@@ -39,9 +73,16 @@ def play_game(player1, player2, board, display=True):
         if display:
             print(f"\n--- {current_player}'s turn ---")
 
+        if track_memory:
+            held = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
         start = time.time()
         move = current_player.get_move(board)
         elapsed = time.time() - start
+        memory = None
+        if track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            memory = {'peak_bytes': peak - held, 'held_bytes': current}
 
         if move is None:
             if display:
@@ -51,9 +92,21 @@ def play_game(player1, player2, board, display=True):
         r, c = move
         board.place(r, c, current_color)
         move_count += 1
+        if history is not None:
+            stats = current_player.last_stats if search_stats else None
+            stats = stats.as_dict() if stats else None
+            if memory is not None:
+                stats = {**(stats or {}), **memory}
+            history.append((current_color, move, elapsed, stats))
 
         if display:
             print(f"  {current_player} plays {format_move(r, c)}  ({elapsed:.2f}s)")
+            report = current_player.search_report()
+            if report:
+                print(f"  {report}")
+            if memory is not None:
+                print(f"  memory: peak {format_bytes(memory['peak_bytes'])} during the move, "
+                      f"{format_bytes(memory['held_bytes'])} held")
             board.display()
 
         if board.check_win(current_color):
@@ -70,13 +123,36 @@ def choose_ai_level(prompt):
     """Prompt user to select an AI difficulty level."""
     while True:
         print(f"\n{prompt}")
-        print("  1) Easy")
-        print("  2) Medium")
-        print("  3) Hard")
+        for key, (level_name, _) in AI_CLASSES.items():
+            print(f"  {key}) {level_name}")
         choice = input("  Choice: ").strip()
         if choice in AI_CLASSES:
             return choice
-        print("  Invalid choice. Enter 1, 2, or 3.")
+        print(f"  Invalid choice. Enter 1-{len(AI_CLASSES)}.")
+
+
+def choose_time_limit():
+    """Prompt for a per-move AI time budget. Returns seconds or None (fixed depth)."""
+    text = input("\nAI time per move in seconds (blank for fixed depth): ").strip()
+    try:
+        seconds = float(text)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def offer_to_save(size, history, winner, red_name, blue_name):
+    """Ask for a file and append the finished game to it as a game record."""
+    if not history:
+        return
+    path = input("\nAppend game record to file (blank to skip): ").strip()
+    if not path:
+        return
+    record = GameRecord.from_history(size, history, winner, Red=red_name, Blue=blue_name,
+                                     Date=time.strftime('%Y-%m-%d'))
+    with open_archive(path, 'a') as f:
+        write_record(f, record)
+    print(f"  Saved to {path}")
 
 
 def human_vs_ai():
@@ -102,14 +178,28 @@ def human_vs_ai():
     size = input(f"\nBoard size (default {DEFAULT_SIZE}): ").strip()
     size = int(size) if size.isdigit() and 2 <= int(size) <= 19 else DEFAULT_SIZE
 
+    time_limit = choose_time_limit()
+
     board = HexBoard(size)
     human = HumanPlayer(human_color)
     ai = ai_class(ai_color)
+    if hasattr(ai, 'tt'):
+        answer = input("\nLet the AI think on your time? [y/N]: ").strip().lower()
+        if answer.startswith('y'):
+            ai = PonderingPlayer(ai)
+
+    history = []
+    try:
+        if human_color == RED:
+            winner = play_game(human, ai, board, time_limit=time_limit, history=history)
+        else:
+            winner = play_game(ai, human, board, time_limit=time_limit, history=history)
+    finally:
+        if isinstance(ai, PonderingPlayer):
+            ai.close()
 
-    if human_color == RED:
-        play_game(human, ai, board)
-    else:
-        play_game(ai, human, board)
+    names = {human_color: "Human", ai_color: level_name}
+    offer_to_save(size, history, winner, names[RED], names[BLUE])
 
 
 def ai_vs_ai_watch():
@@ -117,17 +207,22 @@ def ai_vs_ai_watch():
     level1_key = choose_ai_level("Select RED AI (top <-> bottom):")
     level2_key = choose_ai_level("Select BLUE AI (left <-> right):")
 
-    _, ai1_class = AI_CLASSES[level1_key]
-    _, ai2_class = AI_CLASSES[level2_key]
+    level1_name, ai1_class = AI_CLASSES[level1_key]
+    level2_name, ai2_class = AI_CLASSES[level2_key]
 
     size = input(f"\nBoard size (default {DEFAULT_SIZE}): ").strip()
     size = int(size) if size.isdigit() and 2 <= int(size) <= 19 else DEFAULT_SIZE
 
+    time_limit = choose_time_limit()
+
     board = HexBoard(size)
     player1 = ai1_class(RED)
     player2 = ai2_class(BLUE)
 
-    play_game(player1, player2, board, display=True)
+    history = []
+    winner = play_game(player1, player2, board, display=True, time_limit=time_limit,
+                       history=history)
+    offer_to_save(size, history, winner, level1_name, level2_name)
 
 
 def main_menu():
@@ -1,18 +1,188 @@
 """Minimax and Alpha-Beta search algorithms for Hex."""
 
+import time
 from utils import RED, BLUE, opponent
-from evaluation import _shortest_path_cost
+from evaluation import path_engine, stone_path_costs
+from transposition import EXACT, LOWER, UPPER, TranspositionTable
 
 
-def minimax(board, depth, maximizing, player, eval_fn):
+class SearchTimeout(Exception):
+    """Raised inside a search once its deadline has passed."""
+
+
+class SearchStats:
+    """Opt-in search instrumentation, filled in by a search given ``stats=``.
+
+    Searches only touch these counters behind ``if stats is not None``
+    checks, so leaving stats out costs next to nothing.
+
+    nodes / nodes_by_ply:    positions visited, in total and per ply from the root
+    leaf_evals:              eval_fn calls
+    terminal_hits:           nodes ended by a win for either side
+    cutoffs:                 beta cutoffs keyed by the 0-based index of the
+                             move that caused them (cutoffs[0] / total is
+                             the first-move cutoff rate)
+    cutoffs_by_ply:          beta cutoffs per ply
+    eval_time, check_win_time, order_time:
+                             seconds spent in eval_fn, check_win and move_order_fn
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.nodes_by_ply = {}
+        self.leaf_evals = 0
+        self.terminal_hits = 0
+        self.cutoffs = {}
+        self.cutoffs_by_ply = {}
+        self.eval_time = 0.0
+        self.check_win_time = 0.0
+        self.order_time = 0.0
+        self.root_ply = None  # board move count at the root, set by the first node
+
+    def enter(self, board):
+        """Count a node visit and return its ply from the root."""
+        if self.root_ply is None:
+            self.root_ply = len(board.history)
+        ply = len(board.history) - self.root_ply
+        self.nodes += 1
+        self.nodes_by_ply[ply] = self.nodes_by_ply.get(ply, 0) + 1
+        return ply
+
+    def evaluate(self, eval_fn, board, player):
+        """Call eval_fn, counting and timing it."""
+        start = time.perf_counter()
+        score = eval_fn(board, player)
+        self.eval_time += time.perf_counter() - start
+        self.leaf_evals += 1
+        return score
+
+    def order(self, move_order_fn, board, moves, player):
+        """Call move_order_fn, timing it."""
+        start = time.perf_counter()
+        moves = move_order_fn(board, moves, player)
+        self.order_time += time.perf_counter() - start
+        return moves
+
+    def record_cutoff(self, move_index, ply):
+        self.cutoffs[move_index] = self.cutoffs.get(move_index, 0) + 1
+        self.cutoffs_by_ply[ply] = self.cutoffs_by_ply.get(ply, 0) + 1
+
+    def effective_branching_factor(self):
+        """Geometric mean growth in node count per ply, or None below two plies."""
+        deepest = max(self.nodes_by_ply, default=0)
+        if deepest == 0:
+            return None
+        return (self.nodes_by_ply[deepest] / self.nodes_by_ply[0]) ** (1.0 / deepest)
+
+    def merge(self, other):
+        """Add another SearchStats' counters into this one."""
+        self.nodes += other.nodes
+        self.leaf_evals += other.leaf_evals
+        self.terminal_hits += other.terminal_hits
+        self.eval_time += other.eval_time
+        self.check_win_time += other.check_win_time
+        self.order_time += other.order_time
+        for mine, theirs in ((self.nodes_by_ply, other.nodes_by_ply),
+                             (self.cutoffs, other.cutoffs),
+                             (self.cutoffs_by_ply, other.cutoffs_by_ply)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+
+    def as_dict(self):
+        """JSON-ready snapshot of the counters."""
+        ebf = self.effective_branching_factor()
+        return {
+            'nodes': self.nodes,
+            'nodes_by_ply': {str(k): v for k, v in sorted(self.nodes_by_ply.items())},
+            'leaf_evals': self.leaf_evals,
+            'terminal_hits': self.terminal_hits,
+            'cutoffs_by_index': {str(k): v for k, v in sorted(self.cutoffs.items())},
+            'cutoffs_by_ply': {str(k): v for k, v in sorted(self.cutoffs_by_ply.items())},
+            'effective_branching_factor': round(ebf, 3) if ebf is not None else None,
+            'eval_time': round(self.eval_time, 6),
+            'check_win_time': round(self.check_win_time, 6),
+            'order_time': round(self.order_time, 6),
+        }
+
+    def summary(self):
+        """One-line human-readable statistics."""
+        parts = [f"{self.nodes} nodes", f"{self.leaf_evals} evals",
+                 f"{self.terminal_hits} terminal"]
+        cutoffs = sum(self.cutoffs.values())
+        if cutoffs:
+            parts.append(f"{cutoffs} cutoffs ({self.cutoffs.get(0, 0) / cutoffs:.0%} on 1st move)")
+        ebf = self.effective_branching_factor()
+        if ebf is not None:
+            parts.append(f"EBF {ebf:.1f}")
+        return (", ".join(parts) + f" | eval {self.eval_time:.2f}s, "
+                f"check_win {self.check_win_time:.2f}s, ordering {self.order_time:.2f}s")
+
+
+def _pruning_batch(eval_fn, depth):
+    """eval_fn's batch method for a depth-1 node of a pruning search, or None.
+
+    Evaluation functions with ``full_width_batch`` set only gain from
+    batching when every child is evaluated, so they are skipped here.
+    """
+    if depth != 1 or getattr(eval_fn, 'full_width_batch', False):
+        return None
+    return getattr(eval_fn, 'batch', None)
+
+
+def _evaluate_siblings(board, moves, color, player, batch, stats):
+    """Batch-evaluate the positions after each of color's moves, for player.
+
+    Returns the scores as a list matching moves; only used where every
+    child is a leaf (depth 1).
+    """
+    if stats is None:
+        return batch(board, moves, color, player)
+    start = time.perf_counter()
+    scores = batch(board, moves, color, player)
+    stats.eval_time += time.perf_counter() - start
+    stats.leaf_evals += len(moves)
+    return scores
+
+
+def _batched_leaf(board, player, score, stats):
+    """What a depth-0 search of the (already played) child returns, given its batched score."""
+    opp = opponent(player)
+    if stats is None:
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+    else:
+        stats.enter(board)
+        start = time.perf_counter()
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+        stats.check_win_time += time.perf_counter() - start
+    if won or lost:
+        if stats is not None:
+            stats.terminal_hits += 1
+        return 1000 if won else -1000
+    return score
+
+
+def minimax(board, depth, maximizing, player, eval_fn, stats=None, move_order_fn=None):
     """Plain Minimax search.
 
+    Children are visited by playing and undoing moves on ``board`` in
+    place; the board is left unchanged when the call returns.
+
     Args:
         board: HexBoard instance
         depth: remaining search depth
         maximizing: True if current turn is the maximizing player
         player: the AI's color (the maximizing player)
-        eval_fn: evaluation function(board, player) -> score
+        eval_fn: evaluation function(board, player) -> score; if it has a
+            batch(board, moves, color, player) method returning the scores
+            after each of color's moves, depth-1 nodes evaluate all their
+            children with one call (``alphabeta`` and ``pvs`` skip it when
+            eval_fn.full_width_batch is set)
+        stats: optional SearchStats to count into
+        move_order_fn: optional function(board, moves, player) -> moves;
+            Minimax visits every move anyway, so this is only useful to
+            prune moves (e.g. inferior.InferiorCellFilter)
 
     Returns:
         (score, move) where move is (row, col) or None
@@ -21,44 +191,71 @@ def minimax(board, depth, maximizing, player, eval_fn):
     current = player if maximizing else opp
 
     # Terminal checks
-    if board.check_win(player):
-        return (1000 + depth, None)
-    if board.check_win(opp):
-        return (-1000 - depth, None)
-    if depth == 0:
-        return (eval_fn(board, player), None)
+    if stats is None:
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+    else:
+        stats.enter(board)
+        start = time.perf_counter()
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+        stats.check_win_time += time.perf_counter() - start
+    if won or lost:
+        if stats is not None:
+            stats.terminal_hits += 1
+        return (1000 + depth, None) if won else (-1000 - depth, None)
 
-    empty = board.get_empty_cells()
+    empty = board.get_empty_cells() if depth > 0 else None
     if not empty:
+        if stats is not None:
+            return (stats.evaluate(eval_fn, board, player), None)
         return (eval_fn(board, player), None)
+    if move_order_fn is not None:
+        if stats is not None:
+            empty = stats.order(move_order_fn, board, empty, player)
+        else:
+            empty = move_order_fn(board, empty, player)
 
     best_move = None
+    batch = getattr(eval_fn, 'batch', None) if depth == 1 else None
+    leaf_scores = None
+    if batch is not None:
+        leaf_scores = _evaluate_siblings(board, empty, current, player, batch, stats)
 
     if maximizing:
         best_score = float('-inf')
-        for (r, c) in empty:
-            child = board.clone()
-            child.place(r, c, current)
-            score, _ = minimax(child, depth - 1, False, player, eval_fn)
+        for i, (r, c) in enumerate(empty):
+            board.play(r, c, current)
+            if leaf_scores is None:
+                score, _ = minimax(board, depth - 1, False, player, eval_fn, stats, move_order_fn)
+            else:
+                score = _batched_leaf(board, player, leaf_scores[i], stats)
+            board.undo()
             if score > best_score:
                 best_score = score
                 best_move = (r, c)
         return (best_score, best_move)
     else:
         best_score = float('inf')
-        for (r, c) in empty:
-            child = board.clone()
-            child.place(r, c, current)
-            score, _ = minimax(child, depth - 1, True, player, eval_fn)
+        for i, (r, c) in enumerate(empty):
+            board.play(r, c, current)
+            if leaf_scores is None:
+                score, _ = minimax(board, depth - 1, True, player, eval_fn, stats, move_order_fn)
+            else:
+                score = _batched_leaf(board, player, leaf_scores[i], stats)
+            board.undo()
             if score < best_score:
                 best_score = score
                 best_move = (r, c)
         return (best_score, best_move)
 
 
-def alphabeta(board, depth, alpha, beta, maximizing, player, eval_fn, move_order_fn=None):
+def alphabeta(board, depth, alpha, beta, maximizing, player, eval_fn, move_order_fn=None, tt=None,
+              deadline=None, stats=None, stop=None):
     """Alpha-Beta pruning search.
 
+    Like ``minimax``, the board is searched in place with ``play``/``undo``.
+
     Args:
         board: HexBoard instance
         depth: remaining search depth
@@ -66,59 +263,403 @@ def alphabeta(board, depth, alpha, beta, maximizing, player, eval_fn, move_order
         beta: beta bound
         maximizing: True if current turn is the maximizing player
         player: the AI's color (the maximizing player)
-        eval_fn: evaluation function(board, player) -> score
-        move_order_fn: optional function(board, moves, player) -> sorted moves
+        eval_fn: evaluation function(board, player) -> score; with a batch
+            method (see ``minimax``), the children of a depth-1 node after
+            the first are evaluated in one call unless the first cuts off
+        move_order_fn: optional function(board, moves, player) -> sorted moves;
+            if it also has a record_cutoff(board, move, color, depth) method,
+            that is called for every beta cutoff (see ordering.py)
+        tt: optional TranspositionTable used for cutoffs and to try the
+            stored best move first
+        deadline: optional time.time() value; SearchTimeout is raised once
+            it has passed (the board is then left mid-search)
+        stats: optional SearchStats to count into
+        stop: optional threading.Event; SearchTimeout is raised once it
+            is set, as for the deadline
 
     Returns:
         (score, move) where move is (row, col) or None
     """
+    if deadline is not None and time.time() > deadline:
+        raise SearchTimeout()
+    if stop is not None and stop.is_set():
+        raise SearchTimeout()
+
     opp = opponent(player)
     current = player if maximizing else opp
 
     # Terminal checks
-    if board.check_win(player):
-        return (1000 + depth, None)
-    if board.check_win(opp):
-        return (-1000 - depth, None)
-    if depth == 0:
-        return (eval_fn(board, player), None)
+    if stats is None:
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+    else:
+        ply = stats.enter(board)
+        start = time.perf_counter()
+        won = board.check_win(player)
+        lost = not won and board.check_win(opp)
+        stats.check_win_time += time.perf_counter() - start
+    if won or lost:
+        if stats is not None:
+            stats.terminal_hits += 1
+        return (1000 + depth, None) if won else (-1000 - depth, None)
 
-    empty = board.get_empty_cells()
+    empty = board.get_empty_cells() if depth > 0 else None
     if not empty:
+        if stats is not None:
+            return (stats.evaluate(eval_fn, board, player), None)
         return (eval_fn(board, player), None)
 
+    alpha_orig, beta_orig = alpha, beta
+    tt_move = None
+    if tt is not None:
+        entry = tt.probe(board, current, player)
+        if entry is not None:
+            tt_depth, tt_score, tt_flag, tt_move = entry
+            if tt_depth >= depth:
+                if tt_flag == EXACT:
+                    return (tt_score, tt_move)
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return (tt_score, tt_move)
+
     # Apply move ordering if provided
     if move_order_fn is not None:
-        empty = move_order_fn(board, empty, player)
+        if stats is None:
+            empty = move_order_fn(board, empty, player)
+        else:
+            empty = stats.order(move_order_fn, board, empty, player)
+    if tt_move is not None and tt_move in empty:
+        empty.remove(tt_move)
+        empty.insert(0, tt_move)
 
     best_move = None
+    record_cutoff = getattr(move_order_fn, 'record_cutoff', None)
+    batch = _pruning_batch(eval_fn, depth)
+    leaf_scores = None
 
     if maximizing:
         best_score = float('-inf')
-        for (r, c) in empty:
-            child = board.clone()
-            child.place(r, c, current)
-            score, _ = alphabeta(child, depth - 1, alpha, beta, False, player, eval_fn, move_order_fn)
+        for i, (r, c) in enumerate(empty):
+            if i == 1 and batch is not None:
+                leaf_scores = [None] + _evaluate_siblings(board, empty[1:], current, player,
+                                                          batch, stats)
+            board.play(r, c, current)
+            if leaf_scores is None:
+                score, _ = alphabeta(board, depth - 1, alpha, beta, False, player,
+                                     eval_fn, move_order_fn, tt, deadline, stats, stop)
+            else:
+                score = _batched_leaf(board, player, leaf_scores[i], stats)
+            board.undo()
             if score > best_score:
                 best_score = score
                 best_move = (r, c)
             alpha = max(alpha, best_score)
             if alpha >= beta:
+                if record_cutoff is not None:
+                    record_cutoff(board, best_move, current, depth)
+                if stats is not None:
+                    stats.record_cutoff(i, ply)
                 break
-        return (best_score, best_move)
     else:
         best_score = float('inf')
-        for (r, c) in empty:
-            child = board.clone()
-            child.place(r, c, current)
-            score, _ = alphabeta(child, depth - 1, alpha, beta, True, player, eval_fn, move_order_fn)
+        for i, (r, c) in enumerate(empty):
+            if i == 1 and batch is not None:
+                leaf_scores = [None] + _evaluate_siblings(board, empty[1:], current, player,
+                                                          batch, stats)
+            board.play(r, c, current)
+            if leaf_scores is None:
+                score, _ = alphabeta(board, depth - 1, alpha, beta, True, player,
+                                     eval_fn, move_order_fn, tt, deadline, stats, stop)
+            else:
+                score = _batched_leaf(board, player, leaf_scores[i], stats)
+            board.undo()
             if score < best_score:
                 best_score = score
                 best_move = (r, c)
             beta = min(beta, best_score)
             if alpha >= beta:
+                if record_cutoff is not None:
+                    record_cutoff(board, best_move, current, depth)
+                if stats is not None:
+                    stats.record_cutoff(i, ply)
                 break
-        return (best_score, best_move)
+
+    if tt is not None:
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(board, current, player, depth, best_score, flag, best_move)
+    return (best_score, best_move)
+
+
+# Width of the null window used by pvs: narrower than any score difference
+# the evaluations care about, so it also works for fractional scores.
+NULL_WINDOW = 1e-3
+
+
+def pvs(board, depth, alpha, beta, color, player, eval_fn, move_order_fn=None, tt=None,
+        deadline=None, stats=None, stop=None):
+    """Principal variation search (NegaScout), written in negamax form.
+
+    The first move at every node is searched with the full window; the
+    rest are only tested with a null window around alpha and re-searched
+    when they turn out better. With good move ordering most of those tests
+    fail low cheaply, so fewer nodes are visited than by ``alphabeta``,
+    which returns the same root score.
+
+    Scores are from the point of view of ``color``, the side to move, so
+    the root call (color == player) scores like ``alphabeta``. Leaves are
+    still evaluated for ``player`` and table entries are stored as seen by
+    ``player``, so evaluation caches and transposition tables can be
+    shared with ``alphabeta`` searches.
+
+    Args:
+        board: HexBoard instance, searched in place
+        depth: remaining search depth
+        alpha: alpha bound, for color
+        beta: beta bound, for color
+        color: the side to move
+        player: the AI's color (the side to move at the root)
+        eval_fn, move_order_fn, tt, deadline, stats, stop: as for ``alphabeta``
+
+    Returns:
+        (score, move) where move is (row, col) or None
+    """
+    if deadline is not None and time.time() > deadline:
+        raise SearchTimeout()
+    if stop is not None and stop.is_set():
+        raise SearchTimeout()
+
+    opp = opponent(color)
+
+    # Terminal checks
+    if stats is None:
+        won = board.check_win(color)
+        lost = not won and board.check_win(opp)
+    else:
+        ply = stats.enter(board)
+        start = time.perf_counter()
+        won = board.check_win(color)
+        lost = not won and board.check_win(opp)
+        stats.check_win_time += time.perf_counter() - start
+    if won or lost:
+        if stats is not None:
+            stats.terminal_hits += 1
+        return (1000 + depth, None) if won else (-1000 - depth, None)
+
+    # Table scores and leaf evaluations are for player; flip them for color
+    sign = 1 if color == player else -1
+    empty = board.get_empty_cells() if depth > 0 else None
+    if not empty:
+        if stats is not None:
+            return (sign * stats.evaluate(eval_fn, board, player), None)
+        return (sign * eval_fn(board, player), None)
+
+    alpha_orig, beta_orig = alpha, beta
+    tt_move = None
+    if tt is not None:
+        entry = tt.probe(board, color, player)
+        if entry is not None:
+            tt_depth, tt_score, tt_flag, tt_move = entry
+            if tt_depth >= depth:
+                tt_score *= sign
+                if tt_flag == EXACT:
+                    return (tt_score, tt_move)
+                if (tt_flag == LOWER) == (sign > 0):
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return (tt_score, tt_move)
+
+    if move_order_fn is not None:
+        if stats is None:
+            empty = move_order_fn(board, empty, player)
+        else:
+            empty = stats.order(move_order_fn, board, empty, player)
+    if tt_move is not None and tt_move in empty:
+        empty.remove(tt_move)
+        empty.insert(0, tt_move)
+
+    best_score = float('-inf')
+    best_move = None
+    record_cutoff = getattr(move_order_fn, 'record_cutoff', None)
+    batch = _pruning_batch(eval_fn, depth)
+    leaf_scores = None
+
+    for i, (r, c) in enumerate(empty):
+        if i == 1 and batch is not None:
+            leaf_scores = [None] + _evaluate_siblings(board, empty[1:], color, player,
+                                                      batch, stats)
+        board.play(r, c, color)
+        if leaf_scores is not None:
+            # Leaves are exact, so no null-window test is needed
+            score = sign * _batched_leaf(board, player, leaf_scores[i], stats)
+        elif i == 0:
+            score = -pvs(board, depth - 1, -beta, -alpha, opp, player,
+                         eval_fn, move_order_fn, tt, deadline, stats, stop)[0]
+        else:
+            score = -pvs(board, depth - 1, -alpha - NULL_WINDOW, -alpha, opp, player,
+                         eval_fn, move_order_fn, tt, deadline, stats, stop)[0]
+            # Failed high: score is only a lower bound, unless the window already holds it
+            if alpha + NULL_WINDOW <= score < beta:
+                score = -pvs(board, depth - 1, -beta, -score, opp, player,
+                             eval_fn, move_order_fn, tt, deadline, stats, stop)[0]
+        board.undo()
+        if score > best_score:
+            best_score = score
+            best_move = (r, c)
+        alpha = max(alpha, best_score)
+        if alpha >= beta:
+            if record_cutoff is not None:
+                record_cutoff(board, best_move, color, depth)
+            if stats is not None:
+                stats.record_cutoff(i, ply)
+            break
+
+    if tt is not None:
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        if sign < 0 and flag != EXACT:
+            flag = LOWER if flag == UPPER else UPPER
+        tt.store(board, color, player, depth, sign * best_score, flag, best_move)
+    return (best_score, best_move)
+
+
+ENGINES = ('alphabeta', 'pvs')
+
+
+def search_root(engine, board, depth, alpha, beta, player, eval_fn, move_order_fn=None,
+                tt=None, deadline=None, stats=None, stop=None):
+    """Run one root search with the named engine ('alphabeta' or 'pvs').
+
+    Both engines return (score, move) with the score as seen by player.
+    """
+    if engine == 'pvs':
+        return pvs(board, depth, alpha, beta, player, player, eval_fn, move_order_fn,
+                   tt, deadline, stats, stop)
+    if engine == 'alphabeta':
+        return alphabeta(board, depth, alpha, beta, True, player, eval_fn, move_order_fn,
+                         tt, deadline, stats, stop)
+    raise ValueError(f"Unknown search engine {engine!r}; expected one of {ENGINES}")
+
+
+def iterative_deepening(board, player, eval_fn, time_limit, move_order_fn=None, tt=None,
+                        max_depth=None, stats=None, stop=None, progress=None,
+                        engine='alphabeta', aspiration=None):
+    """Iterative-deepening Alpha-Beta under a wall-clock budget.
+
+    Searches depth 1, 2, ... until the budget runs out or ``stop`` is set.
+    Every iteration shares one transposition table, so each node tries the
+    best move found by the previous iteration first and the principal
+    variation is searched before anything else.
+
+    Args:
+        board: HexBoard instance (restored before returning)
+        player: the AI's color (the maximizing player)
+        eval_fn: evaluation function(board, player) -> score
+        time_limit: seconds available for this move, or None for no limit
+        move_order_fn: optional function(board, moves, player) -> sorted moves
+        tt: optional TranspositionTable; a fresh one is used if omitted
+        max_depth: optional depth cap (defaults to the number of empty cells)
+        stats: optional SearchStats, accumulated over all iterations
+        stop: optional threading.Event that ends the search early
+        progress: optional callback(score, move, depth) run after every
+            completed iteration
+        engine: 'alphabeta' or 'pvs'
+        aspiration: optional half-width of the window searched around the
+            previous iteration's score; a search that falls outside it is
+            repeated with that side of the window opened up
+
+    Returns:
+        (score, move, depth) from the last completed iteration. If not even
+        depth 1 completes, score is None, depth is 0 and move is the first
+        candidate.
+    """
+    start = time.time()
+    deadline = start + time_limit if time_limit is not None else None
+    if tt is None:
+        tt = TranspositionTable()
+
+    empty = board.get_empty_cells()
+    if max_depth is None:
+        max_depth = len(empty)
+    result = (None, empty[0] if empty else None, 0)
+    base_len = len(board.history)
+
+    for depth in range(1, max_depth + 1):
+        iteration_start = time.time()
+        alpha, beta = float('-inf'), float('inf')
+        if aspiration is not None and result[0] is not None:
+            alpha, beta = result[0] - aspiration, result[0] + aspiration
+        try:
+            while True:
+                score, move = search_root(engine, board, depth, alpha, beta, player, eval_fn,
+                                          move_order_fn, tt, deadline, stats, stop)
+                # Re-search only past a bound that was still finite; an
+                # infinite score can never fall inside the window
+                if score <= alpha and alpha > float('-inf'):
+                    alpha = float('-inf')
+                elif score >= beta and beta < float('inf'):
+                    beta = float('inf')
+                else:
+                    break
+        except SearchTimeout:
+            while len(board.history) > base_len:
+                board.undo()
+            break
+        if move is None:
+            # Every move scored -inf, so none beat the initial best; any will do
+            move = result[1]
+        result = (score, move, depth)
+        if progress is not None:
+            progress(score, move, depth)
+        # A forced win or loss will not change with more depth
+        if abs(score) >= 1000:
+            break
+        # The next iteration costs at least as much as this one
+        now = time.time()
+        if deadline is not None and now + (now - iteration_start) > deadline:
+            break
+
+    return result
+
+
+def principal_variation(board, player, tt, max_length=10):
+    """Follow the best moves stored in tt from board, player to move.
+
+    Returns the list of (row, col) moves, stopping at a missing entry, an
+    illegal stored move (hash collision) or a won position. The board is
+    left unchanged.
+    """
+    n = board.size
+    moves = []
+    current = player
+    while len(moves) < max_length:
+        entry = tt.probe(board, current, player)
+        if entry is None or entry[3] is None:
+            break
+        r, c = entry[3]
+        if board.cells[r * n + c]:
+            break
+        board.play(r, c, current)
+        moves.append((r, c))
+        if board.check_win(current):
+            break
+        current = opponent(current)
+    for _ in moves:
+        board.undo()
+    return moves
 
 
 def order_moves_by_heuristic(board, moves, player):
@@ -128,16 +669,35 @@ def order_moves_by_heuristic(board, moves, player):
     cost are ranked first.
     """
     center = board.size / 2.0
+    n = board.size
+    # One full distance field; each candidate is then a local update of it
+    engine = path_engine(n)
+    engine.compute(board.cells, player)
 
     def score(move):
         r, c = move
         # Center distance (lower is better)
         center_dist = abs(r - center) + abs(c - center)
         # Quick path cost check: simulate placing the stone
-        child = board.clone()
-        child.place(r, c, player)
-        path_cost = _shortest_path_cost(child, player)
+        path_cost = engine.cost_with_stone(board.cells, r * n + c)
         # Lower path cost and center distance = better move
         return path_cost + center_dist * 0.1
 
     return sorted(moves, key=score)
+
+
+def order_moves_batched(board, moves, player):
+    """Same ordering as ``order_moves_by_heuristic``, scoring all moves in one pass.
+
+    The path cost with a stone on every cell comes from two distance
+    fields (see ``stone_path_costs``) instead of one search per move.
+    """
+    n = board.size
+    center = n / 2.0
+    costs = stone_path_costs(board, player)
+
+    def score(move):
+        r, c = move
+        return costs[r * n + c] + (abs(r - center) + abs(c - center)) * 0.1
+
+    return sorted(moves, key=score)
@@ -0,0 +1,195 @@
+"""Opening book: precomputed moves for the first plies of a game.
+
+Books are generated offline by searching each opening position with the
+MCTS AI (or the Hard AI), and stored per board size in ``books/book_<size>.bin``:
+
+    magic b'HEXB', version, board size, entry count (uint32), then the
+    entries sorted by key, each a uint64 position key and a uint16 move
+    (flat cell index).
+
+Positions are keyed by ``HexBoard.canonical`` (plus the side to move), so
+a position, its 180° rotation and their color-swapped transposes share
+one entry; moves are stored in the canonical orientation and mapped back
+on lookup. A book file is only read the first time a position of its size
+is looked up.
+
+Usage: python opening_book.py [--size 11] [--plies 2] [--engine mcts|hard]
+                              [--time 5] [--output books/book_11.bin]
+"""
+
+import argparse
+import os
+import struct
+import time
+
+from board import HexBoard, transform_color, transform_index
+from utils import RED, BLUE, format_move
+
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'books')
+MAGIC = b'HEXB'
+VERSION = 2
+_HEADER = struct.Struct('<4sBBI')
+_ENTRY = struct.Struct('<QH')
+_BLUE_TO_MOVE = 0x6A09E667F3BCC908     # mixed into keys of positions with BLUE to move
+
+
+def book_path(size):
+    return os.path.join(BOOK_DIR, f"book_{size}.bin")
+
+
+def canonical_key(board):
+    """Return (key, transform) for board, with the side to move folded in.
+
+    RED always moves first, so the side to move follows from the stone
+    count; a swap transform swaps it along with the stones.
+    """
+    h, transform = board.canonical()
+    to_move = RED if len(board.history) % 2 == 0 else BLUE
+    if transform_color(to_move, transform) == BLUE:
+        h ^= _BLUE_TO_MOVE
+    return h, transform
+
+
+def save_book(path, size, entries):
+    """Write {key: flat move index} to path in the book format."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, size, len(entries)))
+        for key in sorted(entries):
+            f.write(_ENTRY.pack(key, entries[key]))
+
+
+def load_book(path):
+    """Read a book file; returns (size, {key: flat move index})."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, size, count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} opening book")
+    entries = dict(_ENTRY.iter_unpack(data[_HEADER.size:_HEADER.size + count * _ENTRY.size]))
+    return size, entries
+
+
+class OpeningBook:
+    """Book for one board size, loaded from disk on first lookup."""
+
+    def __init__(self, size, path=None):
+        self.size = size
+        self.path = path or book_path(size)
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            if os.path.exists(self.path):
+                _, self._entries = load_book(self.path)
+            else:
+                self._entries = {}
+        return self._entries
+
+    def __len__(self):
+        return len(self._load())
+
+    def lookup(self, board):
+        """Return the book move (row, col) for board, or None."""
+        entries = self._load()
+        if not entries:
+            return None
+        key, transform = canonical_key(board)
+        idx = entries.get(key)
+        if idx is None:
+            return None
+        idx = transform_index(idx, transform, board.size)
+        if board.cells[idx]:
+            return None     # hash collision
+        return divmod(idx, board.size)
+
+
+_BOOKS = {}
+
+
+def book_move(board):
+    """Book move for board from the default book of its size, or None."""
+    book = _BOOKS.get(board.size)
+    if book is None:
+        book = _BOOKS[board.size] = OpeningBook(board.size)
+    return book.lookup(board)
+
+
+def _make_player(engine, color, time_limit):
+    if engine == 'mcts':
+        from ai_mcts import MCTSAI
+        player = MCTSAI(color, seed=0)
+    else:
+        from ai_hard import HardAI
+        player = HardAI(color)
+    player.use_book = False
+    player.time_limit = time_limit
+    return player
+
+
+def generate(size, plies=2, engine='mcts', time_limit=5.0, log=print):
+    """Search every opening position with fewer than plies stones.
+
+    Each side gets a book line: positions where it is to move after
+    following its own book while the opponent played anything. Opponent
+    moves that lead to an already seen canonical position are skipped.
+
+    Returns:
+        {key: flat move index} ready for ``save_book``
+    """
+    entries = {}
+    players = {color: _make_player(engine, color, time_limit) for color in (RED, BLUE)}
+
+    def expand(board, book_side, seen):
+        if len(board.history) >= plies:
+            return
+        to_move = RED if len(board.history) % 2 == 0 else BLUE
+        key, transform = canonical_key(board)
+        if to_move == book_side:
+            if key not in entries:
+                start = time.time()
+                r, c = players[to_move].get_move(board)
+                entries[key] = transform_index(r * size + c, transform, size)
+                line = ' '.join(format_move(*divmod(i, size)) for i in board.history)
+                log(f"  {len(entries):>5} {line or '(empty)'} -> {format_move(r, c)} "
+                    f"({time.time() - start:.1f}s)")
+            idx = transform_index(entries[key], transform, size)
+            board.play(idx // size, idx % size, to_move)
+            expand(board, book_side, seen)
+            board.undo()
+        else:
+            for r, c in board.get_empty_cells():
+                board.play(r, c, to_move)
+                child_key, _ = canonical_key(board)
+                if child_key not in seen:
+                    seen.add(child_key)
+                    expand(board, book_side, seen)
+                board.undo()
+
+    for book_side in (RED, BLUE):
+        expand(HexBoard(size), book_side, set())
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate an opening book for one board size.")
+    parser.add_argument('--size', type=int, default=11)
+    parser.add_argument('--plies', type=int, default=2,
+                        help="book positions have fewer than this many stones")
+    parser.add_argument('--engine', choices=('hard', 'mcts'), default='mcts')
+    parser.add_argument('--time', type=float, default=5.0, help="seconds per position")
+    parser.add_argument('--output', help="book file (default books/book_<size>.bin)")
+    args = parser.parse_args()
+
+    output = args.output or book_path(args.size)
+    print(f"Generating {args.size}x{args.size} book, {args.plies} plies, "
+          f"{args.engine} engine, {args.time}s per position")
+    entries = generate(args.size, args.plies, args.engine, args.time)
+    save_book(output, args.size, entries)
+    print(f"{len(entries)} positions written to {output}")
+
+
+if __name__ == '__main__':
+    main()
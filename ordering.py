@@ -0,0 +1,74 @@
+"""Killer-move and history-heuristic move ordering for alphabeta."""
+
+from minimax import order_moves_batched
+from utils import opponent
+
+
+class KillerHistoryOrdering:
+    """Cheap dynamic move ordering, passed to ``alphabeta`` as move_order_fn.
+
+    Near the root (the first ``heuristic_plies`` plies) moves are ranked by
+    the expensive path-cost ordering ``base_order_fn``. Deeper down they
+    are ranked by a history table: every move that causes a beta cutoff
+    gains depth^2 for the color that played it. The killer moves of the
+    ply (the last cutoff moves seen at that ply) are tried before
+    everything else. ``alphabeta`` reports cutoffs through
+    ``record_cutoff`` and puts the transposition table move (the best move
+    of the previous iteration) ahead of all of these.
+
+    Call ``new_search`` before each root search. Killers are keyed by the
+    board's move number and history is only aged between searches, so
+    both carry over from one move of the game to the next.
+    """
+
+    def __init__(self, heuristic_plies=2, base_order_fn=order_moves_batched, killers_per_ply=2):
+        self.heuristic_plies = heuristic_plies
+        self.base_order_fn = base_order_fn
+        self.killers_per_ply = killers_per_ply
+        self.killers = {}                   # move number -> [move, ...], newest first
+        self.history = {}                   # color -> {move: score}
+        self.root_ply = None
+
+    def new_search(self, board):
+        """Start a search rooted at board: age history, drop stale killers."""
+        self.root_ply = len(board.history)
+        for ply in [p for p in self.killers if p < self.root_ply]:
+            del self.killers[ply]
+        for table in self.history.values():
+            for move in table:
+                table[move] //= 2
+
+    def __call__(self, board, moves, player):
+        ply = len(board.history)
+        if self.root_ply is None:
+            self.root_ply = ply
+        from_root = ply - self.root_ply
+
+        if from_root < self.heuristic_plies:
+            ordered = self.base_order_fn(board, moves, player)
+        else:
+            current = player if from_root % 2 == 0 else opponent(player)
+            history = self.history.get(current)
+            if history:
+                ordered = sorted(moves, key=lambda move: -history.get(move, 0))
+            else:
+                ordered = list(moves)
+
+        killers = self.killers.get(ply)
+        if killers:
+            front = [move for move in killers if move in ordered]
+            if front:
+                ordered = front + [move for move in ordered if move not in front]
+        return ordered
+
+    def record_cutoff(self, board, move, color, depth):
+        """Called by alphabeta when move (played by color) caused a cutoff."""
+        ply = len(board.history)
+        killers = self.killers.setdefault(ply, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.killers_per_ply:]
+
+        history = self.history.setdefault(color, {})
+        history[move] = history.get(move, 0) + depth * depth
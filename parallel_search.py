@@ -0,0 +1,257 @@
+"""Root-parallel Alpha-Beta search over a process pool.
+
+The first root move (the "eldest brother") is searched serially to get a
+real alpha bound, then the remaining root moves are searched in parallel,
+Young-Brothers-Wait style. Workers share the best score found so far
+through a ``multiprocessing.Value`` and re-read it before every reply
+they search, so bounds found by other workers prune the rest of a move.
+Boards are sent to workers in ``HexBoard.encode`` form.
+
+Run as a script to compare serial and parallel times at a fixed depth:
+
+    python parallel_search.py [size] [depth] [workers ...]
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import HexBoard
+from minimax import alphabeta, pvs, search_root, SearchStats
+from transposition import TranspositionTable
+from utils import RED, BLUE, opponent
+
+# Per-worker-process state, set up by _init_worker
+_shared_alpha = None
+_worker_tt = None
+
+
+def _init_worker(shared_alpha, tt_size):
+    global _shared_alpha, _worker_tt
+    _shared_alpha = shared_alpha
+    _worker_tt = TranspositionTable(tt_size) if tt_size else None
+
+
+def _after_root_move(engine, board, depth, alpha, beta, player, eval_fn, move_order_fn, tt, stats):
+    """Score for player of board with the opponent to move, searched by engine."""
+    if engine == 'pvs':
+        score, _ = pvs(board, depth, -beta, -alpha, opponent(player), player,
+                       eval_fn, move_order_fn, tt, stats=stats)
+        return -score
+    score, _ = alphabeta(board, depth, alpha, beta, False, player, eval_fn, move_order_fn, tt,
+                         stats=stats)
+    return score
+
+
+def _search_root_move(board, move, depth, player, eval_fn, move_order_fn, engine, collect_stats):
+    """Search one root move in a worker.
+
+    The opponent's replies are searched one by one with engine, each with
+    the latest shared alpha, and the move is abandoned as soon as it can
+    no longer beat that alpha.
+
+    Returns:
+        (move, score, exact, tt_counters, stats) where exact is False for
+        a score that is only an upper bound at or below the shared alpha,
+        tt_counters the worker table's hit/miss/collision/store counts
+        for this move and stats a SearchStats or None
+    """
+    stats = SearchStats() if collect_stats else None
+    if stats is not None:
+        stats.root_ply = len(board.history)
+    tt = _worker_tt
+    before = tt.stats() if tt is not None else None
+    opp = opponent(player)
+    r, c = move
+    board.play(r, c, player)
+    replies = board.get_empty_cells() if depth > 1 and not board.check_win(player) else None
+    if not replies:
+        alpha = _shared_alpha.value
+        score = _after_root_move(engine, board, depth - 1, alpha, float('inf'), player,
+                                 eval_fn, move_order_fn, tt, stats)
+    else:
+        if move_order_fn is not None:
+            replies = move_order_fn(board, replies, player)
+        score = float('inf')
+        for rr, cc in replies:
+            alpha = _shared_alpha.value   # other workers may have raised it
+            if score <= alpha:
+                break
+            board.play(rr, cc, opp)
+            value, _ = search_root(engine, board, depth - 2, alpha, score, player,
+                                   eval_fn, move_order_fn, tt, stats=stats)
+            board.undo()
+            if value < score:
+                score = value
+    board.undo()
+
+    exact = score > alpha
+    if exact:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    counters = None
+    if tt is not None:
+        after = tt.stats()
+        counters = {key: after[key] - before[key]
+                    for key in ('hits', 'misses', 'collisions', 'stores')}
+    return move, score, exact, counters, stats
+
+
+class RootParallelSearch:
+    """Process pool that splits Alpha-Beta root moves across workers.
+
+    The pool is started on first use and kept for later searches; call
+    ``close`` (or use it as a context manager) to shut it down. Each
+    worker keeps its own transposition table of tt_size slots across
+    searches; ``last_tt_stats`` sums their counters over the last search.
+    """
+
+    def __init__(self, workers=None, tt_size=1 << 16):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.tt_size = tt_size
+        self.last_tt_stats = None
+        self._alpha = None
+        self._pool = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._alpha = multiprocessing.Value('d', float('-inf'))
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._alpha, self.tt_size),
+            )
+        return self._pool
+
+    def search(self, board, depth, player, eval_fn, move_order_fn=None, tt=None,
+               engine='alphabeta', stats=None):
+        """Search board to a fixed depth with player to move (maximizing).
+
+        eval_fn and move_order_fn must be picklable (module-level functions
+        or objects). tt is used for the eldest brother's search in this
+        process; engine ('alphabeta' or 'pvs') runs every search below the
+        root. Returns (score, move) with the same score as the serial
+        search; among equally scored moves a different one may be chosen.
+        """
+        opp = opponent(player)
+        moves = board.get_empty_cells()
+        self.last_tt_stats = None
+        if depth <= 0 or not moves or board.check_win(player) or board.check_win(opp):
+            return search_root(engine, board, depth, float('-inf'), float('inf'), player,
+                               eval_fn, move_order_fn, tt, stats=stats)
+        if move_order_fn is not None:
+            moves = move_order_fn(board, moves, player)
+        if stats is not None:
+            stats.enter(board)   # the root node, which only this process visits
+
+        # Eldest brother first, serially, to establish alpha
+        first = moves[0]
+        board.play(first[0], first[1], player)
+        best_score = _after_root_move(engine, board, depth - 1, float('-inf'), float('inf'),
+                                      player, eval_fn, move_order_fn, tt, stats)
+        board.undo()
+        if len(moves) == 1:
+            return (best_score, first)
+
+        pool = self._ensure_pool()
+        with self._alpha.get_lock():
+            self._alpha.value = best_score
+        futures = [
+            pool.submit(_search_root_move, board, move, depth, player, eval_fn, move_order_fn,
+                        engine, stats is not None)
+            for move in moves[1:]
+        ]
+        results = {}
+        tt_stats = {'hits': 0, 'misses': 0, 'collisions': 0, 'stores': 0}
+        for future in futures:
+            move, score, exact, counters, move_stats = future.result()
+            results[move] = (score, exact)
+            if counters is not None:
+                for key, count in counters.items():
+                    tt_stats[key] += count
+            if move_stats is not None:
+                stats.merge(move_stats)
+        if self.tt_size:
+            self.last_tt_stats = tt_stats
+
+        # Only exact scores count: a bound may tie the best score
+        best_move = first
+        for move in moves[1:]:
+            score, exact = results[move]
+            if exact and score > best_score:
+                best_score = score
+                best_move = move
+        return (best_score, best_move)
+
+    def tt_summary(self):
+        """One-line statistics of the workers' tables over the last search, or None."""
+        s = self.last_tt_stats
+        if s is None:
+            return None
+        probes = s['hits'] + s['misses']
+        rate = s['hits'] / probes if probes else 0.0
+        return (f"worker TTs: {s['hits']} hits, {s['misses']} misses, "
+                f"{s['collisions']} collisions ({rate:.1%} hit rate)")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _benchmark_position(size, seed=0):
+    """Seeded mid-game position with RED to move."""
+    rng = random.Random(seed)
+    board = HexBoard(size)
+    cells = board.get_empty_cells()
+    rng.shuffle(cells)
+    for i, (r, c) in enumerate(cells[:size * size // 5 * 2]):
+        board.play(r, c, RED if i % 2 == 0 else BLUE)
+        if board.check_win(RED) or board.check_win(BLUE):
+            board.undo()
+            break
+    if len(board.history) % 2:
+        board.undo()
+    return board
+
+
+def main(size=9, depth=3, worker_counts=(2, 4)):
+    from evaluation import eval_advanced
+    from minimax import order_moves_batched
+
+    board = _benchmark_position(size)
+    print(f"{size}x{size}, depth {depth}, {len(board.get_empty_cells())} root moves, "
+          f"{multiprocessing.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    serial_score, serial_move = alphabeta(board, depth, float('-inf'), float('inf'), True, RED,
+                                          eval_advanced, order_moves_batched)
+    serial_time = time.perf_counter() - start
+    print(f"  serial       {serial_time:8.2f}s  score {serial_score:.2f}  move {serial_move}")
+
+    for workers in worker_counts:
+        with RootParallelSearch(workers) as searcher:
+            searcher.search(board, 1, RED, eval_advanced)  # start the pool
+            start = time.perf_counter()
+            score, move = searcher.search(board, depth, RED, eval_advanced, order_moves_batched)
+            elapsed = time.perf_counter() - start
+        print(f"  {workers:>2} workers  {elapsed:8.2f}s  score {score:.2f}  move {move}  "
+              f"speedup {serial_time / elapsed:.2f}x")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 9,
+        int(args[1]) if len(args) > 1 else 3,
+        tuple(int(a) for a in args[2:]) or (2, 4),
+    )
@@ -5,7 +5,24 @@ from utils import PLAYER_NAMES, parse_move, format_move
 
 
 class Player(ABC):
-    """Abstract base class for Hex players."""
+    """Abstract base class for Hex players.
+
+    ``time_limit`` is a per-move budget in seconds for AI players; None
+    means they search to their fixed depth. Search-based players fill
+    ``last_stats`` with a SearchStats for each move while ``collect_stats``
+    is set. Players with ``use_book`` set play moves from the opening book
+    (opening_book.py) when the position is in it, without searching.
+    ``stop`` is an optional threading.Event-like object (anything with
+    ``is_set()``); AI players finish early with the best move found so
+    far once it is set. AI players take an optional ``memory_budget`` in
+    bytes, which caps their caches, tables and search trees.
+    """
+
+    time_limit = None
+    stop = None
+    use_book = False
+    collect_stats = False
+    last_stats = None
 
     def __init__(self, color, name=None):
         self.color = color
@@ -19,6 +36,10 @@ class Player(ABC):
         """
         pass
 
+    def search_report(self):
+        """Return a one-line summary of the last search, or None."""
+        return None
+
     def __str__(self):
         return self.name
 
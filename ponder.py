@@ -0,0 +1,186 @@
+"""Pondering: let a search AI keep thinking on its opponent's time."""
+
+import threading
+
+from minimax import iterative_deepening, principal_variation, SearchStats
+from player import Player
+from opening_book import book_move
+from utils import opponent
+
+
+class _Search:
+    """One background iterative-deepening search on its own board copy."""
+
+    def __init__(self, player, board, time_limit=None, max_depth=None, stats=None):
+        self.board = board
+        self.result = None          # (score, move, depth) of the deepest finished iteration
+        self.stop = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, args=(player, time_limit, max_depth, stats), daemon=True
+        )
+        self.thread.start()
+
+    def _run(self, player, time_limit, max_depth, stats):
+        new_search = getattr(player.ordering, 'new_search', None)
+        if new_search is not None:
+            new_search(self.board)
+        iterative_deepening(self.board, player.color, player.eval_fn, time_limit,
+                            player.ordering, player.tt, max_depth, stats=stats,
+                            stop=self.stop, progress=self._progress,
+                            engine=player.ENGINE, aspiration=player.ASPIRATION)
+
+    def _progress(self, score, move, depth):
+        self.result = (score, move, depth)
+
+    def cancel(self):
+        """Stop the search and wait for the thread to finish."""
+        self.stop.set()
+        self.thread.join()
+
+
+class PonderingPlayer(Player):
+    """Wraps a search AI so it ponders while the opponent is thinking.
+
+    After choosing a move, the player predicts the opponent's reply from
+    the principal variation in its transposition table and searches the
+    position after that reply in a background thread. If the opponent
+    plays the predicted move, that search is stopped and its deepest
+    finished result is played directly when it reached the player's
+    depth; otherwise it only warms up the shared transposition table for
+    the real search. On a miss the ponder search is simply cancelled.
+
+    The player's own search also runs in a thread, so pressing Ctrl-C
+    during a long think, or setting ``stop``, ends it and plays the best
+    move found so far. ``time_limit``, ``collect_stats`` and ``stop`` are
+    those of the wrapped player; ``last_stats`` covers the player's own
+    search (it is empty for a move taken from the ponder search).
+
+    The wrapped player must expose ``color``, ``eval_fn``, ``ordering``,
+    ``tt``, ``ENGINE`` and ``ASPIRATION`` (as HardAI does) plus ``DEPTH``
+    for fixed-depth play.
+    Call ``close`` when the game is over to stop pondering.
+    """
+
+    def __init__(self, player):
+        super().__init__(player.color, f"{player.name}, pondering")
+        self.player = player
+        self._ponder = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        self.last_source = None     # 'book', 'ponder', 'search', 'interrupted' or 'stopped'
+        self.last_depth = None
+
+    # The game loop sets these on the wrapper; they belong to the wrapped player
+    @property
+    def time_limit(self):
+        return self.player.time_limit
+
+    @time_limit.setter
+    def time_limit(self, value):
+        self.player.time_limit = value
+
+    @property
+    def collect_stats(self):
+        return self.player.collect_stats
+
+    @collect_stats.setter
+    def collect_stats(self, value):
+        self.player.collect_stats = value
+
+    @property
+    def stop(self):
+        return self.player.stop
+
+    @stop.setter
+    def stop(self, value):
+        self.player.stop = value
+
+    def get_move(self, board):
+        target_depth = None if self.player.time_limit else self.player.DEPTH
+        pondered = self._stop_pondering(board)
+        self.last_depth = None
+        self.last_stats = SearchStats() if self.collect_stats else None
+
+        if self.player.use_book:
+            move = book_move(board)
+            if move is not None:
+                self.last_source = 'book'
+                return move
+
+        if pondered is not None and target_depth is not None and pondered[2] >= target_depth:
+            result = pondered
+            self.last_source = 'ponder'
+        else:
+            result = self._think(board, target_depth)
+            # The ponder search may have got deeper than the real one
+            if pondered is not None and (result is None or pondered[2] > result[2]):
+                result = pondered
+        if result is None:
+            return board.get_empty_cells()[0]
+
+        _, move, self.last_depth = result
+        self._start_pondering(board, move)
+        return move
+
+    def _think(self, board, target_depth):
+        """Search board in a thread; Ctrl-C stops it early.
+
+        Returns the deepest finished (score, move, depth), or None.
+        """
+        search = _Search(self.player, board.clone(), self.player.time_limit, target_depth,
+                         self.last_stats)
+        self.last_source = 'search'
+        while search.thread.is_alive():
+            try:
+                search.thread.join(0.05)
+            except KeyboardInterrupt:
+                search.cancel()
+                self.last_source = 'interrupted'
+            stop = self.player.stop
+            if stop is not None and stop.is_set() and search.thread.is_alive():
+                search.cancel()
+                self.last_source = 'stopped'
+        return search.result
+
+    def _start_pondering(self, board, move):
+        """Search the position after move and the predicted reply in the background."""
+        line = principal_variation(board, self.color, self.player.tt, 2)
+        if len(line) < 2 or line[0] != move:
+            return
+        ponder_board = board.clone()
+        ponder_board.play(move[0], move[1], self.color)
+        ponder_board.play(line[1][0], line[1][1], opponent(self.color))
+        if ponder_board.check_win(opponent(self.color)) or not ponder_board.get_empty_cells():
+            return
+        self._ponder = _Search(self.player, ponder_board)
+
+    def _stop_pondering(self, board):
+        """Cancel any ponder search; return its result if it guessed board, else None."""
+        ponder = self._ponder
+        self._ponder = None
+        if ponder is None:
+            return None
+        ponder.cancel()
+        if ponder.board.hash == board.hash and len(ponder.board.history) == len(board.history):
+            self.ponder_hits += 1
+            return ponder.result
+        self.ponder_misses += 1
+        return None
+
+    def close(self):
+        """Stop pondering."""
+        if self._ponder is not None:
+            self._ponder.cancel()
+            self._ponder = None
+
+    def search_report(self):
+        if self.last_source == 'book':
+            return "book move"
+        parts = [f"{self.last_source} move"]
+        if self.last_depth is not None:
+            parts.append(f"depth {self.last_depth}")
+        guesses = self.ponder_hits + self.ponder_misses
+        if guesses:
+            parts.append(f"ponder hits {self.ponder_hits}/{guesses}")
+        parts.append(self.player.tt.summary())
+        return ", ".join(parts)
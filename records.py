@@ -0,0 +1,361 @@
+"""Game records: a compact text format for finished games, plus bulk analysis.
+
+A record is a block of ``[Key "value"]`` header lines followed by the
+moves in ``format_move`` notation, separated by spaces (and optionally
+spread over several lines). Records are separated by blank lines, so
+archives can simply be appended to:
+
+    [Size "11"]
+    [Red "Hard"]
+    [Blue "MCTS"]
+    [Result "Red"]
+    I5 F7 G6 ...
+
+Result is "Red", "Blue" or "*" for an unfinished game. Other headers are
+free-form. Files ending in ``.gz`` are read and written compressed.
+
+Reading is streaming: ``read_records`` yields one record at a time, and
+moves are only parsed and replayed through ``HexBoard`` when asked for,
+so archives of any size can be analysed in constant memory.
+
+Usage: python records.py analyze games.hgn [more.hgn ...] [--verify]
+       python records.py show games.hgn --game 3
+"""
+
+import argparse
+import gzip
+import re
+import time
+from collections import Counter
+
+from board import HexBoard
+from utils import RED, BLUE, PLAYER_NAMES, format_move, parse_move
+
+RESULTS = {"Red": RED, "Blue": BLUE}
+_HEADER_RE = re.compile(r'^\[(\w+) "((?:[^"\\]|\\.)*)"\]$')
+_UNESCAPE_RE = re.compile(r'\\(.)')
+
+
+class GameRecord:
+    """One game: its headers (an ordered dict of strings) and its moves.
+
+    Args:
+        headers: dict of header values; Size is required
+        moves: list of (row, col), or the move tokens as read from a file
+            (parsed on first access to ``moves``)
+    """
+
+    def __init__(self, headers, moves):
+        self.headers = dict(headers)
+        self._tokens = None
+        self._moves = None
+        if moves and isinstance(moves[0], str):
+            self._tokens = list(moves)
+        else:
+            self._moves = list(moves)
+
+    @classmethod
+    def from_history(cls, size, history, winner, **headers):
+        """Build a record from ``play_game``'s history list.
+
+        Args:
+            size: board size
+            history: list of (color, (row, col), seconds, stats)
+            winner: RED, BLUE or None for an unfinished game
+            headers: extra headers, e.g. Red="Hard", Blue="MCTS"
+        """
+        fields = {'Size': str(size)}
+        fields.update((key, str(value)) for key, value in headers.items())
+        fields['Result'] = PLAYER_NAMES[winner] if winner else "*"
+        return cls(fields, [move for _, move, _, _ in history])
+
+    @property
+    def size(self):
+        return int(self.headers['Size'])
+
+    @property
+    def winner(self):
+        """RED, BLUE or None, as declared by the Result header."""
+        return RESULTS.get(self.headers.get('Result'))
+
+    @property
+    def moves(self):
+        """The moves as (row, col) tuples."""
+        if self._moves is None:
+            size = self.size
+            moves = []
+            for token in self._tokens:
+                move = parse_move(token, size)
+                if move is None:
+                    raise ValueError(f"Bad move {token!r} in game record")
+                moves.append(move)
+            self._moves = moves
+            self._tokens = None
+        return self._moves
+
+    def __len__(self):
+        return len(self._tokens if self._moves is None else self._moves)
+
+    def first_move(self):
+        """The opening move as text (e.g. 'F6'), or None for an empty game."""
+        if self._moves is None:
+            return self._tokens[0].upper() if self._tokens else None
+        return format_move(*self._moves[0]) if self._moves else None
+
+    def replay(self):
+        """Yield (board, color, (row, col)) after each move, replaying lazily.
+
+        The same HexBoard is updated in place and yielded every time;
+        clone it to keep a position. Raises ValueError on an occupied cell.
+        """
+        board = HexBoard(self.size)
+        color = RED
+        for number, (r, c) in enumerate(self.moves, 1):
+            if not board.place(r, c, color):
+                raise ValueError(f"Move {number} ({format_move(r, c)}) is illegal")
+            yield board, color, (r, c)
+            color = BLUE if color == RED else RED
+
+    def final_board(self):
+        """Replay the whole game and return the final HexBoard."""
+        board = HexBoard(self.size)
+        for board, _, _ in self.replay():
+            pass
+        return board
+
+    def check(self):
+        """Replay the game and return the actual winner (RED, BLUE or None).
+
+        Raises ValueError if a move is illegal or the game continues after
+        a win.
+        """
+        winner = None
+        for board, color, _ in self.replay():
+            if winner is not None:
+                raise ValueError("Moves continue after the game was won")
+            if board.check_win(color):
+                winner = color
+        return winner
+
+    def format(self):
+        """The record as text, without the separating blank line."""
+        lines = []
+        for key, value in self.headers.items():
+            value = value.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'[{key} "{value}"]')
+        if self._moves is None:
+            lines.append(' '.join(self._tokens))
+        else:
+            lines.append(' '.join(format_move(r, c) for r, c in self._moves))
+        return '\n'.join(lines)
+
+
+def open_archive(path, mode='r'):
+    """Open a record file for text reading ('r') or appending ('a'); .gz is compressed."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_record(f, record):
+    """Append one record and its separating blank line to an open text file."""
+    f.write(record.format() + '\n\n')
+
+
+def read_records(lines):
+    """Yield GameRecords from an iterable of lines (e.g. an open file).
+
+    Records are parsed one at a time as the lines are consumed.
+    """
+    headers = {}
+    tokens = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            if headers or tokens:
+                yield _make_record(headers, tokens, number)
+                headers, tokens = {}, []
+            continue
+        if line.startswith('['):
+            if tokens:
+                raise ValueError(f"line {number}: header after the move list")
+            match = _HEADER_RE.match(line)
+            if match is None:
+                raise ValueError(f"line {number}: malformed header {line!r}")
+            headers[match.group(1)] = _UNESCAPE_RE.sub(r'\1', match.group(2))
+        else:
+            tokens.extend(line.split())
+    if headers or tokens:
+        yield _make_record(headers, tokens, 'end')
+
+
+def _make_record(headers, tokens, where):
+    if 'Size' not in headers or not headers['Size'].isdigit():
+        raise ValueError(f"line {where}: game record without a valid Size header")
+    return GameRecord(headers, tokens)
+
+
+def iter_archives(paths):
+    """Yield every record from several archive files in turn."""
+    for path in paths:
+        with open_archive(path) as f:
+            yield from read_records(f)
+
+
+def analyze(records, verify=False):
+    """Aggregate statistics over records in one pass.
+
+    Args:
+        records: any iterable of GameRecord (e.g. ``iter_archives(paths)``)
+        verify: replay every game and compare the winner with its Result
+
+    Returns:
+        dict with
+            games, unfinished
+            mismatched, invalid (verify only): games whose Result disagrees
+                         with the replay, and games that cannot be replayed
+            colors:      {'Red': wins, 'Blue': wins}
+            levels:      {level: {'games', 'wins', 'red_games', 'red_wins',
+                                  'blue_games', 'blue_wins'}}, keyed by the
+                         Red / Blue headers
+            lengths:     Counter of game length in moves
+            first_moves: {move: {'games', 'red_wins'}}
+    """
+    games = unfinished = mismatched = invalid = 0
+    colors = {"Red": 0, "Blue": 0}
+    levels = {}
+    lengths = Counter()
+    first_moves = {}
+
+    for record in records:
+        games += 1
+        winner = record.winner
+        if verify:
+            try:
+                if record.check() != winner:
+                    mismatched += 1
+            except ValueError:
+                invalid += 1
+        lengths[len(record)] += 1
+        if winner is None:
+            unfinished += 1
+        else:
+            colors[PLAYER_NAMES[winner]] += 1
+
+        for color, side in ((RED, 'red'), (BLUE, 'blue')):
+            level = record.headers.get(PLAYER_NAMES[color], '?')
+            entry = levels.setdefault(level, {
+                'games': 0, 'wins': 0, 'red_games': 0, 'red_wins': 0,
+                'blue_games': 0, 'blue_wins': 0,
+            })
+            entry['games'] += 1
+            entry[f'{side}_games'] += 1
+            if winner == color:
+                entry['wins'] += 1
+                entry[f'{side}_wins'] += 1
+
+        first = record.first_move()
+        if first is not None:
+            entry = first_moves.setdefault(first, {'games': 0, 'red_wins': 0})
+            entry['games'] += 1
+            if winner == RED:
+                entry['red_wins'] += 1
+
+    result = {
+        'games': games,
+        'unfinished': unfinished,
+        'colors': colors,
+        'levels': levels,
+        'lengths': lengths,
+        'first_moves': first_moves,
+    }
+    if verify:
+        result['mismatched'] = mismatched
+        result['invalid'] = invalid
+    return result
+
+
+def print_analysis(summary, bucket=5, top=10):
+    """Print an ``analyze`` result as tables.
+
+    Args:
+        summary: dict returned by ``analyze``
+        bucket: width of the game-length histogram bins, in moves
+        top: number of most played first moves listed
+    """
+    games = summary['games']
+    print(f"\n  {games} games", end='')
+    if summary['unfinished']:
+        print(f", {summary['unfinished']} unfinished", end='')
+    if 'mismatched' in summary:
+        print(f", {summary['mismatched']} with a wrong Result", end='')
+    if summary.get('invalid'):
+        print(f", {summary['invalid']} invalid", end='')
+    print()
+    if not games:
+        return
+
+    finished = games - summary['unfinished']
+    print(f"\n  {'Color':<10} {'Wins':>6} {'Win %':>7}")
+    for name, wins in summary['colors'].items():
+        rate = wins / finished if finished else 0.0
+        print(f"  {name:<10} {wins:>6} {rate:>7.1%}")
+
+    print(f"\n  {'Level':<10} {'Games':>6} {'Win %':>7} {'as Red':>8} {'as Blue':>8}")
+
+    def rate(wins, played):
+        return f"{wins / played:.1%}" if played else "-"
+
+    ranked = sorted(summary['levels'].items(), key=lambda kv: -kv[1]['wins'] / kv[1]['games'])
+    for level, s in ranked:
+        print(f"  {level:<10} {s['games']:>6} {rate(s['wins'], s['games']):>7} "
+              f"{rate(s['red_wins'], s['red_games']):>8} {rate(s['blue_wins'], s['blue_games']):>8}")
+
+    print(f"\n  {'Length':<10} {'Games':>6}")
+    bins = Counter()
+    for length, count in summary['lengths'].items():
+        bins[length // bucket] += count
+    widest = max(bins.values())
+    for b in sorted(bins):
+        count = bins[b]
+        bar = '#' * max(1, round(40 * count / widest))
+        print(f"  {f'{b * bucket}-{b * bucket + bucket - 1}':<10} {count:>6} {bar}")
+
+    print(f"\n  {'First move':<10} {'Games':>6} {'Red win %':>10}")
+    openings = sorted(summary['first_moves'].items(), key=lambda kv: -kv[1]['games'])
+    for move, s in openings[:top]:
+        print(f"  {move:<10} {s['games']:>6} {rate(s['red_wins'], s['games']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse or replay archived game records.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    p = commands.add_parser('analyze', help="win rates, game lengths and first moves")
+    p.add_argument('paths', nargs='+')
+    p.add_argument('--verify', action='store_true',
+                   help="replay every game and check its Result header")
+    p.add_argument('--bucket', type=int, default=5, help="game-length histogram bin width")
+    p = commands.add_parser('show', help="replay one game and display the final board")
+    p.add_argument('path')
+    p.add_argument('--game', type=int, default=1, help="1-based index of the game in the file")
+    args = parser.parse_args()
+
+    if args.command == 'analyze':
+        start = time.time()
+        summary = analyze(iter_archives(args.paths), args.verify)
+        print_analysis(summary, args.bucket)
+        print(f"\n  ({time.time() - start:.1f}s)")
+        return
+
+    for index, record in enumerate(iter_archives([args.path]), 1):
+        if index == args.game:
+            for key, value in record.headers.items():
+                print(f"  {key}: {value}")
+            print(f"  Moves: {record.format().splitlines()[-1]}")
+            record.final_board().display()
+            return
+    print(f"  {args.path} holds fewer than {args.game} games")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""Fast random playouts (rollouts) from arbitrary positions.
+
+A rollout finishes the game at random in one pass: the side to move gets
+a random half (rounded up) of the empty cells and the opponent the rest,
+which is exactly the final position of a game of uniformly random moves
+played to the end. A full Hex board always has exactly one winner, so a
+single connectivity check for RED decides it; there is no need to play
+move by move and test for a win after each stone.
+
+``RolloutEngine`` runs rollouts in batches, optionally over a process
+pool, and collects win rates plus per-cell statistics: how often each
+color ended up owning a cell and how often it owned the cell and won.
+From those, ``RolloutStats.win_correlation`` gives a cell's importance
+to the game (used e.g. as a move prior or to label training positions).
+
+Run as a script to measure rollout throughput:
+
+    python rollout.py [size] [playouts] [workers ...]
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import HexBoard, neighbor_table
+from utils import RED, BLUE, PLAYER_NAMES, opponent, format_move
+
+# bytes.translate tables that turn every empty cell into one color
+_FILL_TABLES = {
+    color: bytes([color]) + bytes(range(1, 256))
+    for color in (RED, BLUE)
+}
+
+
+def random_fill(cells, empty, to_move, rng):
+    """Return a copy of cells with every empty cell filled at random.
+
+    Args:
+        cells: flat bytearray of the position
+        empty: list of its empty cell indices
+        to_move: color to move; it gets ceil(len(empty) / 2) of the cells
+        rng: random.Random instance
+    """
+    filled = cells.translate(_FILL_TABLES[opponent(to_move)])
+    for i in rng.sample(empty, (len(empty) + 1) // 2):
+        filled[i] = to_move
+    return filled
+
+
+def red_connects(cells, size, neighbors=None):
+    """True if RED stones connect top to bottom.
+
+    Args:
+        cells: flat cells of the (typically full) board; not modified
+        size: board size
+        neighbors: ``neighbor_table(size)``, looked up if omitted
+    """
+    if neighbors is None:
+        neighbors = neighbor_table(size)
+    marks = bytearray(cells)    # visited RED stones are overwritten with 3
+    stack = [c for c in range(size) if marks[c] == RED]
+    for c in stack:
+        marks[c] = 3
+    last_row = size * (size - 1)
+    while stack:
+        u = stack.pop()
+        if u >= last_row:
+            return True
+        for v in neighbors[u]:
+            if marks[v] == RED:
+                marks[v] = 3
+                stack.append(v)
+    return False
+
+
+def full_board_winner(cells, size, neighbors=None):
+    """Winner of a completely filled board."""
+    return RED if red_connects(cells, size, neighbors) else BLUE
+
+
+def _rollout_batch(cells, size, to_move, count, seed):
+    """Play count rollouts; the counting half of ``RolloutEngine.run``.
+
+    Only the cells given to the side to move are counted per rollout:
+    the opponent's counts follow from them and the totals.
+
+    Returns:
+        (wins, owned, owned_won) for the side to move, the lists indexed
+        by flat cell index (zero for occupied cells)
+    """
+    rng = random.Random(seed)
+    neighbors = neighbor_table(size)
+    empty = [i for i, v in enumerate(cells) if not v]
+    k = (len(empty) + 1) // 2
+    base = bytearray(cells).translate(_FILL_TABLES[opponent(to_move)])
+    owned = [0] * (size * size)
+    owned_won = [0] * (size * size)
+    mover_is_red = to_move == RED
+    wins = 0
+    for _ in range(count):
+        mine = rng.sample(empty, k)
+        filled = base[:]
+        for i in mine:
+            filled[i] = to_move
+            owned[i] += 1
+        if red_connects(filled, size, neighbors) == mover_is_red:
+            wins += 1
+            for i in mine:
+                owned_won[i] += 1
+    return wins, owned, owned_won
+
+
+class RolloutStats:
+    """Counts over a set of rollouts from one position.
+
+    ``wins[color]`` is the number of rollouts the color won,
+    ``owned[color][i]`` how often it owned cell i at the end and
+    ``owned_won[color][i]`` how often it owned cell i and won. Stones
+    already on the board count as owned in every rollout.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        n2 = size * size
+        self.playouts = 0
+        self.wins = {RED: 0, BLUE: 0}
+        self.owned = {RED: [0] * n2, BLUE: [0] * n2}
+        self.owned_won = {RED: [0] * n2, BLUE: [0] * n2}
+
+    def add_batch(self, cells, to_move, playouts, wins, owned, owned_won):
+        """Add the counts of one ``_rollout_batch`` run on cells."""
+        other = opponent(to_move)
+        other_wins = playouts - wins
+        self.playouts += playouts
+        self.wins[to_move] += wins
+        self.wins[other] += other_wins
+        for i, v in enumerate(cells):
+            if v:
+                self.owned[v][i] += playouts
+                self.owned_won[v][i] += wins if v == to_move else other_wins
+            else:
+                self.owned[to_move][i] += owned[i]
+                self.owned_won[to_move][i] += owned_won[i]
+                self.owned[other][i] += playouts - owned[i]
+                self.owned_won[other][i] += other_wins - (owned[i] - owned_won[i])
+
+    def merge(self, other):
+        """Add another RolloutStats for the same position into this one."""
+        self.playouts += other.playouts
+        for color in (RED, BLUE):
+            self.wins[color] += other.wins[color]
+            for mine, theirs in ((self.owned[color], other.owned[color]),
+                                 (self.owned_won[color], other.owned_won[color])):
+                for i, count in enumerate(theirs):
+                    mine[i] += count
+
+    def win_rate(self, color):
+        return self.wins[color] / self.playouts if self.playouts else 0.0
+
+    def ownership(self, color):
+        """Fraction of rollouts in which color owned each cell."""
+        playouts = self.playouts or 1
+        return [count / playouts for count in self.owned[color]]
+
+    def win_correlation(self, color):
+        """Per cell, color's win rate when it owned the cell minus when it did not.
+
+        Cells whose owner never varied (stones, or too few rollouts) get 0.0.
+        """
+        wins = self.wins[color]
+        result = []
+        for owned, owned_won in zip(self.owned[color], self.owned_won[color]):
+            not_owned = self.playouts - owned
+            if owned and not_owned:
+                result.append(owned_won / owned - (wins - owned_won) / not_owned)
+            else:
+                result.append(0.0)
+        return result
+
+    def most_critical(self, color, count=5):
+        """The count cells with the highest win correlation, as [((row, col), value)]."""
+        ranked = sorted(enumerate(self.win_correlation(color)), key=lambda kv: -kv[1])
+        return [(divmod(i, self.size), value) for i, value in ranked[:count]]
+
+
+class RolloutEngine:
+    """Runs batches of rollouts, in this process or over a process pool.
+
+    The pool is started on first use and kept for later runs; call
+    ``close`` (or use the engine as a context manager) to shut it down.
+
+    Args:
+        workers: processes to spread batches over; 1 runs them inline
+        batch_size: rollouts per batch (per pool task)
+        seed: seed for the per-batch seeds, for repeatable results
+    """
+
+    def __init__(self, workers=1, batch_size=500, seed=None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self._pool = None
+
+    def run(self, board, playouts, to_move=None):
+        """Play playouts rollouts from board and return their RolloutStats.
+
+        to_move defaults to the side to move by stone count (RED first).
+        The position must not be won already.
+        """
+        if to_move is None:
+            to_move = RED if len(board.history) % 2 == 0 else BLUE
+        cells = bytes(board.cells)
+        size = board.size
+        jobs = []
+        remaining = playouts
+        while remaining > 0:
+            count = min(self.batch_size, remaining)
+            jobs.append((cells, size, to_move, count, self.rng.getrandbits(64)))
+            remaining -= count
+
+        if self.workers > 1 and len(jobs) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            results = self._pool.map(_rollout_batch, *zip(*jobs))
+        else:
+            results = (_rollout_batch(*job) for job in jobs)
+
+        stats = RolloutStats(size)
+        for job, (wins, owned, owned_won) in zip(jobs, results):
+            stats.add_batch(cells, to_move, job[3], wins, owned, owned_won)
+        return stats
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(size=11, playouts=20000, worker_counts=(1, 2)):
+    board = HexBoard(size)
+    board.play(size // 2, size // 2, RED)
+    print(f"{size}x{size}, {playouts} rollouts after {format_move(size // 2, size // 2)}, "
+          f"{multiprocessing.cpu_count()} CPUs")
+
+    for workers in worker_counts:
+        with RolloutEngine(workers, seed=0) as engine:
+            engine.run(board, engine.batch_size * workers)   # start the pool
+            start = time.perf_counter()
+            stats = engine.run(board, playouts)
+            elapsed = time.perf_counter() - start
+        print(f"  {workers:>2} workers  {elapsed:7.2f}s  {playouts / elapsed:>8.0f} rollouts/s  "
+              f"{PLAYER_NAMES[BLUE]} wins {stats.win_rate(BLUE):.1%}")
+
+    cells = ", ".join(f"{format_move(r, c)} {value:+.3f}"
+                      for (r, c), value in stats.most_critical(BLUE))
+    print(f"  most critical cells for {PLAYER_NAMES[BLUE]}: {cells}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if len(args) > 0 else 11,
+        int(args[1]) if len(args) > 1 else 20000,
+        tuple(int(a) for a in args[2:]) or (1, 2),
+    )
@@ -0,0 +1,373 @@
+"""Position analysis server: warm AI engines behind a JSON-lines protocol.
+
+Requests and responses are JSON objects, one per line, read from stdin and
+written to stdout, or exchanged over a local socket (one stream per client):
+
+    python server.py [--workers N] [--memory-budget MB]
+                     [--port 8765 | --socket /tmp/hex.sock]
+
+An analysis request names a position by its moves in ``format_move``
+notation (RED first), as a list or a space-separated string:
+
+    {"id": 1, "size": 11, "moves": "F6 E7", "level": "hard", "time_limit": 2}
+
+and is answered, possibly out of order, with
+
+    {"id": 1, "ok": true, "move": "G5", "color": "Red", "depth": 4, "complete": true,
+     "pv": ["G5", "F7"], "elapsed": 1.98, "cancelled": false, "report": "..."}
+
+depth is null for a book move or an MCTS search. complete is false when
+the search was cancelled or timed out before finishing even depth 1; the
+move is then null rather than an unsearched guess.
+level is easy, medium, hard or mcts (default hard). Without time_limit the
+level searches to its fixed depth (or playout count). Other requests:
+
+    {"id": 2, "op": "cancel", "target": 1}   stop request 1 early; it is
+                                             answered with its best move so far
+    {"id": 3, "op": "ping"}
+    {"id": 4, "op": "status"}
+
+Errors are answered with {"id": ..., "ok": false, "error": "..."}.
+
+Searches run in a process pool. Each worker keeps its players (and with
+them their transposition tables, evaluation caches and opening books)
+between requests, so follow-up positions of the same game start warm.
+With --memory-budget each of those players keeps its transposition
+tables, evaluation caches and MCTS tree within that size (see the README),
+so a worker's tables total at most MAX_ENGINES budgets.
+Cancellation goes through a shared array of flags, one slot per running
+request, that the worker's player polls as its ``stop`` flag.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from board import HexBoard
+from main import AI_CLASSES
+from minimax import principal_variation
+from utils import RED, BLUE, PLAYER_NAMES, format_move, parse_move
+
+LEVELS = {name.lower(): cls for name, cls in AI_CLASSES.values()}
+MAX_ENGINES = 8         # warm players kept per worker process
+MAX_TIME = 60.0         # cap on any one request, in seconds
+GRACE = 1.0             # seconds past a search's budget before it is cancelled
+MAX_PENDING = 64        # requests running or queued at once
+PV_LENGTH = 6
+
+# Per-worker-process state, set up by _init_worker
+_cancel_flags = None
+_memory_budget = None
+_engines = OrderedDict()
+
+
+class _CancelFlag:
+    """Event-like view of one slot of the shared cancel array.
+
+    Also reads as set once the deadline (a ``time.perf_counter`` value)
+    has passed. ``fired`` records whether the search was actually stopped.
+    """
+
+    def __init__(self, flags, slot, deadline):
+        self.flags = flags
+        self.slot = slot
+        self.deadline = deadline
+        self.fired = False
+
+    def is_set(self):
+        if self.flags[self.slot] or time.perf_counter() > self.deadline:
+            self.fired = True
+        return self.fired
+
+
+def _init_worker(cancel_flags, memory_budget):
+    global _cancel_flags, _memory_budget
+    _cancel_flags = cancel_flags
+    _memory_budget = memory_budget
+
+
+def _engine(level, size, color):
+    """The worker's warm player for (level, size, color), created on first use."""
+    key = (level, size, color)
+    player = _engines.get(key)
+    if player is None:
+        player = _engines[key] = LEVELS[level](color, memory_budget=_memory_budget)
+        if len(_engines) > MAX_ENGINES:
+            _engines.popitem(last=False)
+    else:
+        _engines.move_to_end(key)
+    return player
+
+
+def _analyze(level, board, time_limit, max_time, slot):
+    """Search board in a worker with the side to move. Returns the response fields.
+
+    The search is cancelled through slot, or after max_time seconds as a
+    backstop for fixed-depth searches and overrunning time limits.
+    """
+    color = RED if len(board.history) % 2 == 0 else BLUE
+    player = _engine(level, board.size, color)
+    start = time.perf_counter()
+    stop = _CancelFlag(_cancel_flags, slot, start + max_time)
+    player.time_limit = time_limit
+    player.stop = stop
+    try:
+        move = player.get_move(board)
+    finally:
+        player.time_limit = None
+        player.stop = None
+    elapsed = time.perf_counter() - start
+    depth = getattr(player, 'last_depth', None)
+    # Iterative deepening reports depth 0 when no iteration finished
+    complete = depth != 0
+
+    result = {
+        'move': format_move(*move) if complete else None,
+        'color': PLAYER_NAMES[color],
+        'depth': depth,
+        'complete': complete,
+        'elapsed': round(elapsed, 3),
+        'cancelled': stop.fired,
+        'report': player.search_report(),
+    }
+    tt = getattr(player, 'tt', None)
+    if complete and tt is not None and not getattr(player, 'from_book', False):
+        pv = principal_variation(board, color, tt, PV_LENGTH)
+        if pv and pv[0] == move:
+            result['pv'] = [format_move(r, c) for r, c in pv]
+    return result
+
+
+def parse_position(size, moves):
+    """Build the board for a request, validating every move.
+
+    Args:
+        size: board size (2-19)
+        moves: list of move strings, or one space-separated string
+
+    Raises:
+        ValueError: bad size, unparsable or occupied move, or a finished game
+    """
+    if not isinstance(size, int) or not 2 <= size <= 19:
+        raise ValueError(f"size must be an integer from 2 to 19, not {size!r}")
+    if isinstance(moves, str):
+        moves = moves.split()
+    board = HexBoard(size)
+    color = RED
+    for number, text in enumerate(moves, 1):
+        move = parse_move(text, size) if isinstance(text, str) else None
+        if move is None:
+            raise ValueError(f"move {number} ({text!r}) is not a move on a {size}x{size} board")
+        if not board.place(*move, color):
+            raise ValueError(f"move {number} ({text}) is on an occupied cell")
+        if board.check_win(color):
+            raise ValueError(f"{PLAYER_NAMES[color]} has already won")
+        color = BLUE if color == RED else RED
+    return board
+
+
+class AnalysisServer:
+    """Serves analysis requests from any number of JSON-lines streams.
+
+    The worker pool is shared by all streams and started on first use;
+    call ``close`` (or use the server as a context manager) to shut it down.
+
+    Args:
+        workers: worker processes (default: one per CPU)
+        max_time: longest any request may search, in seconds
+        memory_budget: optional per-player memory budget in bytes
+    """
+
+    def __init__(self, workers=None, max_time=MAX_TIME, memory_budget=None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_time = max_time
+        self.memory_budget = memory_budget
+        self.served = 0
+        self._flags = None
+        self._free_slots = list(range(MAX_PENDING))
+        self._pool = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._flags = multiprocessing.Array('b', MAX_PENDING, lock=False)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._flags, self.memory_budget),
+            )
+        return self._pool
+
+    async def handle(self, request, running):
+        """Answer one request.
+
+        Args:
+            request: the decoded JSON object
+            running: {request id: cancel slot} of the requesting stream's
+                analyses in progress, so that cancel only reaches its own
+        """
+        op = request.get('op', 'analyze')
+        if op == 'ping':
+            return {'ok': True}
+        if op == 'status':
+            return {'ok': True, 'workers': self.workers, 'running': MAX_PENDING - len(self._free_slots),
+                    'served': self.served}
+        if op == 'cancel':
+            slot = running.get(request.get('target'))
+            if slot is None:
+                return {'ok': False, 'error': f"no running request {request.get('target')!r}"}
+            self._flags[slot] = 1
+            return {'ok': True}
+        if op != 'analyze':
+            return {'ok': False, 'error': f"unknown op {op!r}"}
+
+        request_id = request.get('id')
+        level = str(request.get('level', 'hard')).lower()
+        time_limit = request.get('time_limit')
+        if level not in LEVELS:
+            return {'ok': False, 'error': f"level must be one of {', '.join(LEVELS)}"}
+        if time_limit is not None and (isinstance(time_limit, bool)
+                                       or not isinstance(time_limit, (int, float)) or time_limit <= 0):
+            return {'ok': False, 'error': "time_limit must be a positive number of seconds"}
+        if request_id in running:
+            return {'ok': False, 'error': f"request {request_id!r} is already running"}
+        try:
+            board = parse_position(request.get('size'), request.get('moves', []))
+        except ValueError as exc:
+            return {'ok': False, 'error': str(exc)}
+        if not self._free_slots:
+            return {'ok': False, 'error': "server busy"}
+
+        pool = self._ensure_pool()
+        slot = self._free_slots.pop()
+        self._flags[slot] = 0
+        running[request_id] = slot
+        loop = asyncio.get_running_loop()
+        limit = min(time_limit, self.max_time) if time_limit else None
+        try:
+            result = await loop.run_in_executor(
+                pool, _analyze, level, board, limit, (limit or self.max_time) + GRACE, slot
+            )
+        except Exception as exc:
+            return {'ok': False, 'error': f"{type(exc).__name__}: {exc}"}
+        finally:
+            del running[request_id]
+            self._free_slots.append(slot)
+        self.served += 1
+        return {'ok': True, **result}
+
+    async def serve_stream(self, reader, write, cancel_at_eof=False):
+        """Answer every request line from reader until EOF.
+
+        Requests run concurrently; write(line) is called with each
+        response line as it completes. Analyses still running when the
+        stream ends are awaited, after cancelling them if cancel_at_eof.
+        """
+        running = {}
+        tasks = set()
+
+        async def respond(request):
+            response = await self.handle(request, running)
+            await write(json.dumps({'id': request.get('id'), **response}) + '\n')
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+                if any(isinstance(request.get(key), (list, dict)) for key in ('id', 'target')):
+                    raise ValueError("ids must be strings, numbers or null")
+            except ValueError as exc:
+                await write(json.dumps({'id': None, 'ok': False, 'error': f"bad request: {exc}"}) + '\n')
+                continue
+            task = asyncio.create_task(respond(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if cancel_at_eof:
+            for slot in running.values():
+                self._flags[slot] = 1
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def serve_stdio(self):
+        """Serve requests from stdin, answering on stdout, until EOF."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        async def write(line):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+        await self.serve_stream(reader, write)
+
+    async def serve_socket(self, port=None, path=None):
+        """Serve clients on 127.0.0.1:port or a unix socket path, forever."""
+        async def client(reader, writer):
+            async def write(line):
+                if not writer.is_closing():
+                    writer.write(line.encode())
+                    await writer.drain()
+
+            try:
+                await self.serve_stream(reader, write, cancel_at_eof=True)
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        if path is not None:
+            server = await asyncio.start_unix_server(client, path)
+        else:
+            server = await asyncio.start_server(client, '127.0.0.1', port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve position analysis as JSON lines.")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPUs)")
+    parser.add_argument('--max-time', type=float, default=MAX_TIME,
+                        help="longest search allowed per request, in seconds")
+    parser.add_argument('--memory-budget', type=float, default=None, metavar='MB',
+                        help="cap each warm player's caches and tables at this many megabytes")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument('--port', type=int, help="listen on 127.0.0.1:PORT instead of stdin")
+    where.add_argument('--socket', metavar='PATH', help="listen on a unix socket instead of stdin")
+    args = parser.parse_args()
+
+    budget = int(args.memory_budget * (1 << 20)) if args.memory_budget else None
+    with AnalysisServer(args.workers, args.max_time, budget) as server:
+        if args.port is None and args.socket is None:
+            asyncio.run(server.serve_stdio())
+            return
+        print(f"Serving analysis on {args.socket or f'127.0.0.1:{args.port}'}", file=sys.stderr)
+        try:
+            asyncio.run(server.serve_socket(args.port, args.socket))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
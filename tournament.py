@@ -0,0 +1,217 @@
+"""Headless AI-vs-AI tournaments.
+
+Plays round-robin matches between the levels in ``main.AI_CLASSES`` over a
+process pool, swapping colors every game, and streams one JSON line per
+finished game to the output file while the run is in progress.
+
+Usage: python tournament.py [--levels 1 2 3] [--games 10] [--size 11]
+                            [--workers N] [--time-limit S] [--seed 0]
+                            [--output tournament.jsonl] [--stats]
+                            [--records games.hgn] [--memory]
+                            [--memory-budget MB]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from board import HexBoard
+from main import AI_CLASSES, DEFAULT_SIZE, play_game
+from records import GameRecord, open_archive
+from utils import RED, BLUE, PLAYER_NAMES, format_bytes
+
+
+def schedule(levels, games_per_pair, size, time_limit=None, seed=0, stats=False,
+             record=False, memory=False, memory_budget=None):
+    """Yield one job per game: every pair of levels plays games_per_pair games.
+
+    Colors alternate between games of a pair. Each job is a tuple
+    (game_id, red_level, blue_level, size, time_limit, seed, stats, record,
+    memory, memory_budget).
+    """
+    game_id = 0
+    for a, b in itertools.combinations(levels, 2):
+        for i in range(games_per_pair):
+            red, blue = (a, b) if i % 2 == 0 else (b, a)
+            yield (game_id, red, blue, size, time_limit, seed + game_id, stats, record,
+                   memory, memory_budget)
+            game_id += 1
+
+
+def play_job(job):
+    """Play one scheduled game without display and return its result record.
+
+    With the job's record flag set, the result also holds the game in the
+    records.py format under 'record'. With its memory flag set, the result
+    holds every move's peak and held bytes under 'move_memory'.
+    """
+    game_id, red_key, blue_key, size, time_limit, seed, stats, record, memory, memory_budget = job
+    random.seed(seed)
+    red = AI_CLASSES[red_key][1](RED, memory_budget=memory_budget)
+    blue = AI_CLASSES[blue_key][1](BLUE, memory_budget=memory_budget)
+    board = HexBoard(size)
+    history = []
+
+    start = time.time()
+    winner = play_game(red, blue, board, display=False, time_limit=time_limit, history=history,
+                       search_stats=stats, track_memory=memory)
+    duration = time.time() - start
+
+    result = {
+        'game': game_id,
+        'size': size,
+        'red': AI_CLASSES[red_key][0],
+        'blue': AI_CLASSES[blue_key][0],
+        'winner': PLAYER_NAMES[winner] if winner else None,
+        'winner_level': AI_CLASSES[red_key if winner == RED else blue_key][0] if winner else None,
+        'moves': len(history),
+        'move_times': [round(seconds, 4) for _, _, seconds, _ in history],
+        'duration': round(duration, 3),
+        'seed': seed,
+    }
+    if stats:
+        result['move_stats'] = [move_stats for _, _, _, move_stats in history]
+    if memory:
+        result['move_memory'] = [[move_stats['peak_bytes'], move_stats['held_bytes']]
+                                 for _, _, _, move_stats in history]
+        result['peak_bytes'] = max((peak for peak, _ in result['move_memory']), default=0)
+    if record:
+        headers = {'Game': game_id, 'Red': result['red'], 'Blue': result['blue'],
+                   'Seed': seed}
+        if time_limit is not None:
+            headers['TimeLimit'] = time_limit
+        result['record'] = GameRecord.from_history(size, history, winner, **headers).format()
+    return result
+
+
+def run_tournament(levels=None, games_per_pair=10, size=DEFAULT_SIZE, workers=None,
+                   output='tournament.jsonl', time_limit=None, seed=0, progress=None,
+                   stats=False, records=None, memory=False, memory_budget=None):
+    """Run a round-robin tournament and stream results to a JSONL file.
+
+    Args:
+        levels: AI_CLASSES keys to include (default: all)
+        games_per_pair: games played by each pair of levels
+        size: board size
+        workers: process count (default: one per CPU)
+        output: path of the JSONL results file (overwritten)
+        time_limit: optional per-move budget in seconds
+        seed: base random seed; game i uses seed + i
+        progress: optional callback(result) called for every finished game
+        stats: record per-move SearchStats in each result ('move_stats')
+        records: optional path of a game record archive (see records.py)
+            that every finished game is appended to
+        memory: record per-move peak and held memory ('move_memory', as
+            [peak_bytes, held_bytes] pairs) and the game's 'peak_bytes';
+            tracemalloc slows the games down
+        memory_budget: optional per-player memory budget in bytes
+
+    Returns:
+        dict mapping level name -> {'games': n, 'wins': n}
+    """
+    levels = list(levels or AI_CLASSES)
+    workers = workers or os.cpu_count() or 1
+    jobs = schedule(levels, games_per_pair, size, time_limit, seed, stats, records is not None,
+                    memory, memory_budget)
+    standings = {AI_CLASSES[k][0]: {'games': 0, 'wins': 0} for k in levels}
+    archive_file = open_archive(records, 'a') if records is not None else nullcontext()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(output, 'w') as out, \
+            archive_file as archive:
+        # Keep a bounded number of games in flight so huge runs stay light
+        max_pending = workers * 4
+        pending = set()
+        while True:
+            for job in itertools.islice(jobs, max_pending - len(pending)):
+                pending.add(pool.submit(play_job, job))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if archive is not None:
+                    archive.write(result.pop('record') + "\n\n")
+                    archive.flush()
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+                for side in ('red', 'blue'):
+                    standings[result[side]]['games'] += 1
+                if result['winner_level']:
+                    standings[result['winner_level']]['wins'] += 1
+                if progress is not None:
+                    progress(result)
+
+    return standings
+
+
+def print_standings(standings):
+    """Print win counts and win rates per level, best first."""
+    print(f"\n  {'Level':<10} {'Games':>6} {'Wins':>6} {'Win %':>7}")
+    ranked = sorted(standings.items(), key=lambda kv: -kv[1]['wins'] / max(kv[1]['games'], 1))
+    for name, s in ranked:
+        rate = s['wins'] / s['games'] if s['games'] else 0.0
+        print(f"  {name:<10} {s['games']:>6} {s['wins']:>6} {rate:>7.1%}")
+
+
+def _print_progress(result):
+    memory = f", peak {format_bytes(result['peak_bytes'])}" if 'peak_bytes' in result else ""
+    print(f"  game {result['game']:>5}: {result['red']} (Red) vs {result['blue']} (Blue) "
+          f"-> {result['winner_level']} in {result['moves']} moves ({result['duration']:.1f}s{memory})")
+
+
+def run_tournament_menu():
+    """Interactive setup for a tournament run from the main menu."""
+    names = ", ".join(f"{k}={name}" for k, (name, _) in AI_CLASSES.items())
+    text = input(f"\nLevels to include ({names}; blank for all): ").split()
+    levels = [k for k in text if k in AI_CLASSES] or list(AI_CLASSES)
+
+    games = input("Games per pair (default 10): ").strip()
+    games = int(games) if games.isdigit() and int(games) > 0 else 10
+
+    size = input(f"Board size (default {DEFAULT_SIZE}): ").strip()
+    size = int(size) if size.isdigit() and 2 <= int(size) <= 19 else DEFAULT_SIZE
+
+    workers = input("Worker processes (blank for one per CPU): ").strip()
+    workers = int(workers) if workers.isdigit() and int(workers) > 0 else None
+
+    output = input("Results file (default tournament.jsonl): ").strip() or 'tournament.jsonl'
+
+    print(f"\nRunning tournament, results streamed to {output} ...")
+    standings = run_tournament(levels, games, size, workers, output, progress=_print_progress)
+    print_standings(standings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless AI-vs-AI round-robin tournament.")
+    parser.add_argument('--levels', nargs='+', choices=list(AI_CLASSES), default=list(AI_CLASSES))
+    parser.add_argument('--games', type=int, default=10, help="games per pair of levels")
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--time-limit', type=float, default=None, help="seconds per AI move")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='tournament.jsonl')
+    parser.add_argument('--quiet', action='store_true', help="do not print each game")
+    parser.add_argument('--stats', action='store_true', help="record per-move search statistics")
+    parser.add_argument('--records', help="append every game to this record archive (.gz to compress)")
+    parser.add_argument('--memory', action='store_true',
+                        help="record per-move peak memory (tracemalloc; slower)")
+    parser.add_argument('--memory-budget', type=float, default=None, metavar='MB',
+                        help="cap each AI's caches and tables at this many megabytes")
+    args = parser.parse_args()
+
+    budget = int(args.memory_budget * (1 << 20)) if args.memory_budget else None
+    standings = run_tournament(args.levels, args.games, args.size, args.workers, args.output,
+                               args.time_limit, args.seed,
+                               progress=None if args.quiet else _print_progress,
+                               stats=args.stats, records=args.records,
+                               memory=args.memory, memory_budget=budget)
+    print_standings(standings)
+
+
+if __name__ == '__main__':
+    main()
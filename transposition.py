@@ -0,0 +1,147 @@
+"""Transposition table for alpha-beta search."""
+
+import random
+from board import IDENTITY, transform_color, transform_move
+from utils import RED, BLUE
+
+# Bound types for stored scores
+EXACT = 0
+LOWER = 1   # score is a lower bound (search failed high)
+UPPER = 2   # score is an upper bound (search failed low)
+
+POLICIES = ('depth', 'two-tier')
+
+# Approximate bytes per stored entry: the 5-tuple plus its key int, score
+# float and move tuple (about 199 measured with tracemalloc), plus the slot.
+ENTRY_BYTES = 208
+
+# Keys mixed into the board hash so the same stones with a different side to
+# move, or scored for a different player, never share an entry.
+_rng = random.Random(0x7AB1E)
+_SIDE_KEYS = {RED: _rng.getrandbits(64), BLUE: _rng.getrandbits(64)}
+_PLAYER_KEYS = {RED: _rng.getrandbits(64), BLUE: _rng.getrandbits(64)}
+
+
+def table_size(max_bytes, policy='two-tier'):
+    """Number of slots of a table that stays within max_bytes when full.
+
+    Never less than one, so a budget too small for a single slot still
+    gives a working (if useless) table.
+    """
+    tiers = 2 if policy == 'two-tier' else 1
+    return max(1, int(max_bytes) // (tiers * ENTRY_BYTES))
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by Zobrist hash.
+
+    Each entry holds (key, depth, score, flag, move). Scores are stored as
+    seen by the maximizing ``player`` of the search that produced them.
+
+    Replacement policies:
+        'depth':    one entry per slot; a new result replaces the old one
+                    only if it was searched at least as deep.
+        'two-tier': two entries per slot; a depth-preferred tier plus an
+                    always-replace tier for everything the first rejects.
+
+    With ``symmetric`` set, positions are keyed by ``HexBoard.canonical``,
+    so a position and its symmetric images share one entry. Stored moves
+    are kept in the canonical orientation and mapped back on probe. Only
+    use it with evaluations invariant under the board symmetries, as for
+    ``EvalCache``.
+
+    ``max_bytes`` is an optional memory ceiling for the full table; it
+    lowers size to fit using ENTRY_BYTES per entry (see ``table_size``).
+    """
+
+    def __init__(self, size=1 << 16, policy='two-tier', symmetric=False, max_bytes=None):
+        if max_bytes is not None:
+            size = min(size, table_size(max_bytes, policy))
+        if size < 1:
+            raise ValueError("Transposition table size must be positive")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy {policy!r}; expected one of {POLICIES}")
+        self.size = size
+        self.policy = policy
+        self.symmetric = symmetric
+        self.clear()
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        self._deep = [None] * self.size
+        self._recent = [None] * self.size if self.policy == 'two-tier' else None
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def _key(self, board, current, player):
+        """Return (key, transform) for board with current to move, scored for player.
+
+        In symmetric mode the key is that of the canonical board, with
+        current and player mapped through the same transform.
+        """
+        if not self.symmetric:
+            return board.hash ^ _SIDE_KEYS[current] ^ _PLAYER_KEYS[player], IDENTITY
+        h, transform = board.canonical()
+        return (h ^ _SIDE_KEYS[transform_color(current, transform)]
+                ^ _PLAYER_KEYS[transform_color(player, transform)]), transform
+
+    def probe(self, board, current, player):
+        """Look up the position.
+
+        Returns (depth, score, flag, move) or None if it is not stored.
+        """
+        key, transform = self._key(board, current, player)
+        slot = key % self.size
+        occupied = False
+        for tier in (self._deep, self._recent):
+            if tier is None:
+                continue
+            entry = tier[slot]
+            if entry is None:
+                continue
+            if entry[0] == key:
+                self.hits += 1
+                if transform != IDENTITY and entry[4] is not None:
+                    return entry[1:4] + (transform_move(entry[4], transform, board.size),)
+                return entry[1:]
+            occupied = True
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, board, current, player, depth, score, flag, move):
+        """Record a search result for the position."""
+        key, transform = self._key(board, current, player)
+        slot = key % self.size
+        if transform != IDENTITY and move is not None:
+            move = transform_move(move, transform, board.size)
+        entry = (key, depth, score, flag, move)
+        self.stores += 1
+
+        old = self._deep[slot]
+        if old is None or old[0] == key or depth >= old[1]:
+            self._deep[slot] = entry
+            if self._recent is not None and old is not None and old[0] != key:
+                self._recent[slot] = old
+        elif self._recent is not None:
+            self._recent[slot] = entry
+
+    def stats(self):
+        """Return the hit/miss/collision counters as a dict."""
+        probes = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'hit_rate': self.hits / probes if probes else 0.0,
+        }
+
+    def summary(self):
+        """One-line human-readable statistics."""
+        s = self.stats()
+        return (f"TT: {s['hits']} hits, {s['misses']} misses, "
+                f"{s['collisions']} collisions ({s['hit_rate']:.1%} hit rate)")
@@ -13,6 +13,15 @@ def opponent(player):
     return BLUE if player == RED else RED
 
 
+def format_bytes(count):
+    """Format a byte count for display, e.g. 1536 -> '1.5 KB'."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(count) < 1024:
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
 def col_label(col):
     """Return letter label for a column index (0 -> 'A', 1 -> 'B', ...)."""
     return chr(ord('A') + col)